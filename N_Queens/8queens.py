@@ -1,99 +1,151 @@
-import numpy as np
-
-# Hàm kiểm tra xem đã tìm được một lời giải hợp lệ chưa
-def is_valid_state(state, num_queens):
-    # Một lời giải hợp lệ khi đã đặt đủ số quân hậu
-    return len(state) == num_queens
-
-# Hàm lấy các vị trí (cột) ứng viên cho hàng tiếp theo
-def get_candidates(state, num_queens):
-    # Nếu chưa có quân hậu nào, tất cả các cột đều là ứng viên
-    if not state:
-        return range(num_queens)
-
-    # Vị trí (hàng) hiện tại đang cần đặt quân hậu
-    position = len(state)
-    # Bắt đầu với tất cả các cột có thể
-    candidates = set(range(num_queens))
-
-    # Lặp qua các quân hậu đã đặt để loại bỏ các vị trí bị tấn công
-    for row, col in enumerate(state):
-        # 1. Loại bỏ cột đã có quân hậu (tấn công theo chiều dọc)
-        candidates.discard(col)
-        
-        # 2. Loại bỏ các vị trí bị tấn công theo đường chéo
-        # Tính khoảng cách hàng giữa vị trí hiện tại và quân hậu đã đặt
-        # === PHẦN SỬA 1 ===
-        dist = position - row 
-        
-        # Loại bỏ vị trí trên đường chéo (xuống-phải)
-        candidates.discard(col + dist)
-        # Loại bỏ vị trí trên đường chéo (xuống-trái)
-        candidates.discard(col - dist)
+import argparse
+import sys
+from itertools import islice
 
-    return candidates
+import numpy as np
 
-# Hàm tìm kiếm đệ quy (backtracking)
-def search(state, solutions, num_queens):
-    # Nếu đã tìm thấy một lời giải hoàn chỉnh, thêm vào danh sách và dừng nhánh này
-    if is_valid_state(state, num_queens):
-        solutions.append(state.copy())
-        return
-    
-    # Lặp qua các ứng viên hợp lệ cho hàng hiện tại
-    for candidate in get_candidates(state, num_queens):
-        # Đặt thử quân hậu vào vị trí ứng viên
-        state.append(candidate)
-        # Tiếp tục tìm kiếm cho hàng tiếp theo
-        search(state, solutions, num_queens)
-        # Quay lui (backtrack): gỡ quân hậu vừa đặt ra để thử phương án khác
-        # Dòng print này giúp theo dõi quá trình quay lui
-        # print(f"Backtracking from state: {state}") 
-        state.pop() # Sử dụng pop() hiệu quả hơn remove(candidate) khi phần tử cuối cùng luôn là phần tử cần xóa
+# Các engine tìm kiếm (set gốc, bitmask) nằm trong engines.py;
+# solve(num_queens, engine=...) mặc định dùng engine bitmask
+# count(num_queens) chỉ đếm số lời giải, không lưu bàn cờ nào
+# iter_solutions(num_queens, limit, start_prefix) sinh lời giải lần lượt
+from engines import DEFAULT_ENGINE, ENGINES, count, iter_solutions, solve
+# find_one(num_queens, method) tìm một lời giải cho N rất lớn (min-conflicts)
+from local_search import METHODS, find_one
+# cached_count tra bảng số lời giải đã biết (N <= 27) hoặc cache trên đĩa
+from cache import cached_count
+from rendering import format_solutions
+# SearchStats đếm số nút/ứng viên bị loại theo độ sâu khi truyền vào solve()/count()
+from stats import SearchStats
+# complete(num_queens, fixed, blocked) hoàn thành bàn cờ có quân cố định/ô cấm
+from constrained import complete, count_completions, infeasible_reason, parse_cell
+# fundamental_solutions(num_queens) chỉ trả về các lời giải khác nhau qua phép quay/lật
+from symmetry import fundamental_solutions, total_from_fundamental
+from validation import is_valid_placement, validate_batch
 
-# Hàm chính để giải bài toán
-def solve(num_queens):
-    solutions = []
-    state = []
-    search(state, solutions, num_queens)
-    return solutions
+# Số lời giải được dựng và in cùng một lần
+PRINT_BATCH = 4096
 
 # Hàm main chạy chương trình
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Giải bài toán N quân hậu")
+    parser.add_argument("num_queens", nargs="?", type=int,
+                        help="số quân hậu (bỏ trống để nhập từ bàn phím)")
+    parser.add_argument("--count", action="store_true",
+                        help="chỉ đếm số lời giải, không in bàn cờ")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="luôn tính lại, không dùng bảng/cache khi đếm")
+    parser.add_argument("--fundamental", action="store_true",
+                        help="chỉ liệt kê các lời giải cơ bản (khác nhau qua phép quay/lật)")
+    parser.add_argument("--first", action="store_true",
+                        help="chỉ tìm một lời giải (dùng được cho N rất lớn)")
+    parser.add_argument("--method", choices=sorted(METHODS), default="min-conflicts",
+                        help="phương pháp tìm một lời giải khi dùng --first")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="hạt giống ngẫu nhiên cho --first")
+    parser.add_argument("--fix", type=parse_cell, action="append", default=[], metavar="R,C",
+                        help="quân hậu cố định tại hàng R, cột C (lặp lại được)")
+    parser.add_argument("--block", type=parse_cell, action="append", default=[], metavar="R,C",
+                        help="ô cấm tại hàng R, cột C (lặp lại được)")
+    parser.add_argument("--limit", type=int, default=None,
+                        help="chỉ in tối đa LIMIT lời giải đầu tiên")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default=DEFAULT_ENGINE,
+                        help="engine tìm kiếm dùng để liệt kê lời giải")
+    parser.add_argument("--stats", choices=("json", "prometheus"), default=None,
+                        help="in thống kê tìm kiếm (số nút, quay lui, ...) sau khi giải")
+    args = parser.parse_args()
+    # Quân cố định/ô cấm chỉ được hỗ trợ khi đếm và liệt kê bằng constrained.py
+    if args.fix or args.block:
+        for option, used in (("--fundamental", args.fundamental), ("--first", args.first),
+                             ("--stats", args.stats), ("--engine", args.engine != DEFAULT_ENGINE)):
+            if used:
+                parser.error(f"{option} không dùng được cùng --fix/--block")
+    if args.stats and args.engine != "bitmask":
+        parser.error("--stats chỉ hỗ trợ engine bitmask")
+    # Thống kê chỉ được thu khi đếm hoặc liệt kê mọi lời giải
+    for option, used in (("--fundamental", args.fundamental), ("--first", args.first)):
+        if args.stats and used:
+            parser.error(f"--stats không dùng được cùng {option}")
+    stats = SearchStats() if args.stats else None
+
+    try:
+        if args.num_queens is not None:
+            num_queens = args.num_queens
+        else:
+            num_queens = int(input("Nhap so quan hau (ví dụ: 4 hoặc 8): "))
+    except ValueError:
+        print("Đầu vào không hợp lệ. Vui lòng nhập một số nguyên.")
+        sys.exit(1)
+
     try:
-        num_queens = int(input("Nhap so quan hau (ví dụ: 4 hoặc 8): "))
         if num_queens <= 0:
             print("Vui lòng nhập một số nguyên dương.")
+        elif args.count:
+            # Cùng cách chọn nguồn kết quả với lệnh count của nqueens.py
+            if args.block:
+                total = count_completions(num_queens, args.fix, set(args.block))
+            elif args.fix:
+                if args.no_cache:
+                    total = count_completions(num_queens, args.fix)
+                else:
+                    total = cached_count(num_queens, args.fix)
+            elif stats is not None or args.no_cache:
+                total = count(num_queens, stats=stats)
+            else:
+                total = cached_count(num_queens)
+            print(f"=> Tong so loi giai tim duoc: {total}")
+        elif args.fundamental:
+            fundamentals = fundamental_solutions(num_queens)
+            for index, (solution, size) in enumerate(fundamentals, start=1):
+                print(f"Loi giai co ban {index}: {solution} (quy dao {size})")
+            print(f"\n=> {len(fundamentals)} loi giai co ban, "
+                  f"tong so loi giai: {total_from_fundamental(fundamentals)}")
+        elif args.first:
+            cols = find_one(num_queens, method=args.method, seed=args.seed)
+            if cols is None:
+                print(f"Không tìm được lời giải cho {num_queens} quân hậu.")
+            elif num_queens <= 64:
+                print(f"=> Loi giai: {cols.tolist()}")
+            else:
+                print(f"=> Tim duoc loi giai cho {num_queens} quan hau, "
+                      f"hop le: {is_valid_placement(cols)}")
         else:
             print(f"Bàn cờ trống {num_queens}x{num_queens}:")
             empty_board = np.full((num_queens, num_queens), "-")
             print(empty_board)
             
-            solutions = solve(num_queens)
-            
-            print(f"\n=> Tong so loi giai tim duoc: {len(solutions)}")
+            # Engine bitmask sinh lời giải lần lượt nên không cần giữ cả danh sách trong bộ nhớ
+            if args.fix or args.block:
+                reason = infeasible_reason(num_queens, args.fix, set(args.block))
+                if reason:
+                    print(f"Vô nghiệm: {reason}")
+                solutions = complete(num_queens, args.fix, set(args.block), limit=args.limit)
+            elif args.engine == DEFAULT_ENGINE and stats is None:
+                solutions = iter_solutions(num_queens, limit=args.limit)
+            else:
+                solutions = solve(num_queens, engine=args.engine, stats=stats)[:args.limit]
             
-            # In ra từng lời giải
-            for index, solution in enumerate(solutions, start=1):
-                board = np.full((num_queens, num_queens), "-")
-                for row, col in enumerate(solution):
-                    board[row][col] = 'Q'
-                
-                print(f"\n--- Loi giai {index}: {solution} ---")
-                
-                # In bàn cờ
-                for row in board:
-                    print(" ".join(row))
-                
-                # In theo tọa độ
-                # === PHẦN SỬA 2 ===
-                print("Toa do cac quan hau (hàng, cột):", end=" ")
-                coordinates = []
-                for row, col in enumerate(solution):
-                    coordinates.append(f"({row}, {col})")
-                print(", ".join(coordinates))
+            # In theo từng lô: kiểm tra và dựng bàn cờ cho cả lô bằng NumPy,
+            # rồi ghi ra một lần để việc in chỉ còn phụ thuộc vào I/O
+            index = 0
+            solutions = iter(solutions)
+            while True:
+                batch = list(islice(solutions, PRINT_BATCH))
+                if not batch:
+                    break
+                batch = np.array(batch, dtype=np.intp)
+                if not validate_batch(batch).all():
+                    raise AssertionError("Engine trả về lời giải không hợp lệ")
+                sys.stdout.write(format_solutions(batch, start=index + 1))
+                index += len(batch)
 
-    except ValueError:
-        print("Đầu vào không hợp lệ. Vui lòng nhập một số nguyên.")
+            print(f"\n=> Tong so loi giai tim duoc: {index}")
+
+        if stats is not None and stats.finished is not None:
+            sys.stdout.write(stats.to_json(indent=2) + "\n" if args.stats == "json" else stats.to_prometheus())
+
+    except ValueError as e:
+        # Lỗi đầu vào từ các hàm giải, ví dụ quân hậu nằm ngoài bàn cờ
+        print(f"Lỗi: {e}", file=sys.stderr)
+        sys.exit(2)
 
 
@@ -0,0 +1,314 @@
+# Đo tốc độ các đường giải và phát hiện hồi quy hiệu năng
+#
+# Cách chạy:
+#   python benchmark.py compare [n_min] [n_max]
+#       so sánh solve() giữa các engine (mặc định N = 8..15)
+#   python benchmark.py suite [--n-min 4] [--n-max 16] [--json out.json]
+#                             [--baseline base.json] [--max-slowdown 0.25]
+#       chạy mọi engine ở các chế độ count / all / first, ghi kết quả JSON và
+#       so với baseline; trả về mã lỗi 1 nếu có trường hợp chậm đi quá ngưỡng.
+#       Chế độ render vẽ đường đi tới lời giải của minh_hoa.py (mặc định và
+#       fast) thành khung hình, chỉ với N <= RENDER_N_MAX
+#   python benchmark.py overhead [n_min] [n_max]
+#       chi phí của thống kê tìm kiếm (stats.py): solve()/count() có và không có stats
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from multiprocessing import get_context
+
+from cache import KNOWN_COUNTS
+from constructive import construct
+from dlx import count_dlx, dlx_solutions
+from engines import ENGINES, count, get_candidates, is_valid_state, iter_solutions, solve
+from local_search import find_one
+from parallel import parallel_count, parallel_solve
+from stats import SearchStats, instrumented_search
+from symmetry import fundamental_solutions, total_from_fundamental
+from validation import is_valid_placement
+
+# Đo thời gian giải bài toán num_queens quân hậu bằng một engine
+def time_engine(num_queens, engine):
+    start = time.perf_counter()
+    solutions = solve(num_queens, engine=engine)
+    return time.perf_counter() - start, solutions
+
+def run_benchmark(n_min=8, n_max=15, baseline="set"):
+    engines = [baseline] + [name for name in ENGINES if name != baseline]
+    header = f"{'N':>3} {'loi giai':>10}" + "".join(f"{name + ' (s)':>14}" for name in engines) + f"{'tang toc':>10}"
+    print(header)
+    for num_queens in range(n_min, n_max + 1):
+        timings = {}
+        reference = None
+        for engine in engines:
+            elapsed, solutions = time_engine(num_queens, engine)
+            # Mọi engine phải trả về cùng các lời giải, cùng thứ tự
+            if reference is None:
+                reference = solutions
+            elif solutions != reference:
+                raise AssertionError(f"Engine {engine} cho kết quả khác {baseline} với N={num_queens}")
+            timings[engine] = elapsed
+        fastest = min(timings[name] for name in engines if name != baseline)
+        row = f"{num_queens:>3} {len(reference):>10}" + "".join(f"{timings[name]:>14.3f}" for name in engines)
+        print(row + f"{timings[baseline] / fastest:>9.1f}x")
+
+# Lời giải đầu tiên bằng engine set gốc: quay lui như search_set nhưng dừng ở lời giải đầu
+def first_set(num_queens, state=None):
+    state = [] if state is None else state
+    if is_valid_state(state, num_queens):
+        return state.copy()
+    for candidate in sorted(get_candidates(state, num_queens)):
+        state.append(candidate)
+        solution = first_set(num_queens, state)
+        state.pop()
+        if solution is not None:
+            return solution
+    return None
+
+# Import minh_hoa khi cần, với backend Agg cho các trường hợp vẽ
+def load_visualizer():
+    os.environ.setdefault("MPLBACKEND", "Agg")
+    import minh_hoa
+    return minh_hoa
+
+# Lời giải đầu tiên theo đường minh họa (search_for_final_solution của minh_hoa.py,
+# ghi vết bằng search_trace.py); chỉ tìm kiếm, không vẽ
+def first_visualizer(num_queens):
+    path = load_visualizer().search_for_final_solution([], num_queens)
+    return path[-1][1] if path else None
+
+# Đường đi tới lời giải được tìm một lần cho mỗi N để trường hợp render chỉ đo phần vẽ
+@lru_cache(maxsize=None)
+def visualizer_path(num_queens):
+    return load_visualizer().search_for_final_solution([], num_queens) or []
+
+# Vẽ mọi bước của đường đi trên một figure như khi export video; trả về các khung hình RGB
+def render_visualizer(num_queens, fast=False):
+    return load_visualizer().render_steps(num_queens, visualizer_path(num_queens), fast=fast,
+                                          collect_frames=True)
+
+# Các trường hợp đo: (engine, chế độ) -> hàm nhận N và trả về kết quả.
+# Các cặp không có (không có đường giải tương ứng để đo):
+#   parallel/first        chia việc theo tiền tố nên không có "lời giải đầu" riêng
+#   fundamental/all, first chỉ trả về đại diện của từng lớp đối xứng
+#   min-conflicts, constructive count/all: chỉ tìm một lời giải
+#   visualizer count/all  chỉ đi theo đường tới lời giải đầu tiên
+CASES = {
+    ("set", "all"): lambda n: solve(n, engine="set"),
+    ("bitmask", "all"): lambda n: solve(n, engine="bitmask"),
+    ("dlx", "all"): lambda n: solve(n, engine="dlx"),
+    ("parallel", "all"): lambda n: parallel_solve(n),
+    ("set", "count"): lambda n: len(solve(n, engine="set")),
+    ("bitmask", "count"): count,
+    ("dlx", "count"): count_dlx,
+    ("parallel", "count"): lambda n: parallel_count(n),
+    ("fundamental", "count"): lambda n: total_from_fundamental(fundamental_solutions(n)),
+    ("set", "first"): first_set,
+    ("bitmask", "first"): lambda n: next(iter_solutions(n), None),
+    ("dlx", "first"): lambda n: next(dlx_solutions(n), None),
+    ("min-conflicts", "first"): lambda n: find_one(n, seed=0),
+    ("constructive", "first"): construct,
+    ("visualizer", "first"): first_visualizer,
+    ("visualizer", "render"): render_visualizer,
+    ("visualizer-fast", "render"): lambda n: render_visualizer(n, fast=True),
+}
+MODES = ("count", "all", "first", "render")
+# Vẽ tốn thời gian theo số khung hình và kích thước bàn cờ: chỉ đo N nhỏ
+RENDER_N_MAX = 10
+# Các engine duyệt cùng một cây quay lui (hàng theo thứ tự, cột tăng dần)
+BACKTRACKING_ENGINES = ("set", "bitmask", "parallel", "visualizer")
+
+# Số nút của cây quay lui mà các engine trong BACKTRACKING_ENGINES duyệt qua,
+# đếm bằng bản có thống kê của engine bitmask (không tính giờ).
+# count() chỉ duyệt nửa trái của hàng đầu nên cây nhỏ hơn.
+def tree_nodes(num_queens, mode):
+    stats = SearchStats()
+    instrumented_search(num_queens, stats, mode)
+    return stats.total_nodes
+
+# Chi phí của thống kê: so solve()/count() thường (không truyền stats) với bản
+# có truyền SearchStats. Đường không có stats phải giữ nguyên tốc độ cũ.
+def instrumentation_overhead(n_min=8, n_max=12, repeat=3):
+    print(f"{'N':>3} {'che do':>6} {'tat (s)':>10} {'bat (s)':>10} {'ti le':>7}")
+    rows = []
+    for num_queens in range(n_min, n_max + 1):
+        for mode, run in (("all", solve), ("count", count)):
+            disabled = min(_timed(run, num_queens) for _ in range(repeat))
+            enabled = min(_timed(run, num_queens, stats=SearchStats()) for _ in range(repeat))
+            ratio = enabled / disabled if disabled > 0 else None
+            rows.append({"n": num_queens, "mode": mode, "disabled": disabled, "enabled": enabled, "ratio": ratio})
+            print(f"{num_queens:>3} {mode:>6} {disabled:>10.4f} {enabled:>10.4f} {ratio:>6.2f}x")
+    return rows
+
+def _timed(run, *args, **kwargs):
+    start = time.perf_counter()
+    run(*args, **kwargs)
+    return time.perf_counter() - start
+
+# Kết quả của một trường hợp có đúng không
+def check_result(num_queens, mode, result):
+    expected = KNOWN_COUNTS[num_queens] if num_queens < len(KNOWN_COUNTS) else None
+    if mode == "count":
+        return expected is None or result == expected
+    if mode == "all":
+        return expected is None or len(result) == expected
+    if mode == "render":
+        # Đường đi gồm N bước đặt quân và bước lời giải; không có lời giải thì không có khung hình
+        frames = num_queens + 1 if expected else 0
+        return len(result) == frames and all(frame.ndim == 3 and frame.shape[2] == 3 for frame in result)
+    if result is None:
+        return expected == 0
+    return is_valid_placement(result, num_queens)
+
+def measure(engine, mode, num_queens, repeat=1, trace_memory=True):
+    case = CASES[(engine, mode)]
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = case(num_queens)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    if not check_result(num_queens, mode, result):
+        raise AssertionError(f"{engine}/{mode} cho kết quả sai với N={num_queens}")
+    record = {
+        "engine": engine,
+        "mode": mode,
+        "n": num_queens,
+        "seconds": best,
+        "nodes": None,
+        "nodes_per_sec": None,
+        "peak_tracemalloc_bytes": None,
+        "peak_rss_kb": None,
+    }
+    if engine in BACKTRACKING_ENGINES and mode != "render":
+        # Engine set đếm bằng len(solve()) nên duyệt cả cây
+        record["nodes"] = tree_nodes(num_queens, "all" if (engine, mode) == ("set", "count") else mode)
+        record["nodes_per_sec"] = record["nodes"] / best if best > 0 else None
+    if trace_memory:
+        # Chạy thêm một lần dưới tracemalloc (chậm hơn nên không tính giờ)
+        tracemalloc.start()
+        case(num_queens)
+        record["peak_tracemalloc_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        record["peak_rss_kb"] = case_peak_rss(engine, mode, num_queens)
+    return record
+
+# Chạy một trường hợp trong tiến trình con (chạy ở tiến trình mới)
+def _run_case_rss(engine, mode, num_queens):
+    CASES[(engine, mode)](num_queens)
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+# RSS đỉnh (KB trên Linux) của riêng một trường hợp. ru_maxrss của tiến trình
+# đo không bao giờ giảm nên chạy trường hợp trong một tiến trình mới ("spawn",
+# không kế thừa bộ nhớ của các trường hợp trước); số đo gồm cả phần nền của
+# trình thông dịch và các module đã import.
+def case_peak_rss(engine, mode, num_queens):
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+        return executor.submit(_run_case_rss, engine, mode, num_queens).result()
+
+def run_suite(n_min=4, n_max=16, engines=None, modes=MODES, repeat=1, max_seconds=5.0,
+              trace_memory=True, verbose=True):
+    results = []
+    for engine, mode in CASES:
+        if (engines and engine not in engines) or mode not in modes:
+            continue
+        if engine.startswith("visualizer"):
+            # Import minh_hoa trước để thời gian import không tính vào lần đo đầu
+            load_visualizer()
+        for num_queens in range(n_min, n_max + 1):
+            if mode == "render":
+                if num_queens > RENDER_N_MAX:
+                    break
+                visualizer_path(num_queens)
+            record = measure(engine, mode, num_queens, repeat, trace_memory)
+            results.append(record)
+            if verbose:
+                nodes = "" if record["nodes"] is None else f"{record['nodes']:>12} nut"
+                print(f"{engine:>14} {mode:>6} N={num_queens:<3} {record['seconds']:>10.4f}s {nodes}")
+            # N tăng thì thời gian tăng nhanh: dừng engine này khi đã vượt ngân sách
+            if record["seconds"] > max_seconds:
+                break
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.time(),
+        },
+        "results": results,
+    }
+
+# So sánh với baseline; trả về danh sách các trường hợp chậm đi quá ngưỡng.
+# Các trường hợp quá nhanh (dưới min_seconds) bị bỏ qua vì nhiễu đo lớn.
+def compare_with_baseline(report, baseline, max_slowdown=0.25, min_seconds=0.01):
+    reference = {(r["engine"], r["mode"], r["n"]): r["seconds"] for r in baseline["results"]}
+    regressions = []
+    for record in report["results"]:
+        key = (record["engine"], record["mode"], record["n"])
+        before = reference.get(key)
+        if before is None or before < min_seconds:
+            continue
+        ratio = record["seconds"] / before
+        if ratio > 1 + max_slowdown:
+            regressions.append({"case": key, "baseline": before, "seconds": record["seconds"], "ratio": ratio})
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Đo tốc độ các engine N quân hậu")
+    commands = parser.add_subparsers(dest="command", required=True)
+    compare_parser = commands.add_parser("compare", help="so sánh solve() giữa các engine")
+    compare_parser.add_argument("n_min", type=int, nargs="?", default=8)
+    compare_parser.add_argument("n_max", type=int, nargs="?", default=15)
+    overhead_parser = commands.add_parser("overhead", help="chi phí của thống kê tìm kiếm")
+    overhead_parser.add_argument("n_min", type=int, nargs="?", default=8)
+    overhead_parser.add_argument("n_max", type=int, nargs="?", default=12)
+    suite_parser = commands.add_parser("suite", help="chạy toàn bộ bộ đo, ghi JSON, so với baseline")
+    suite_parser.add_argument("--n-min", type=int, default=4)
+    suite_parser.add_argument("--n-max", type=int, default=16)
+    suite_parser.add_argument("--engines", nargs="*", default=None,
+                              help="chỉ đo các engine này (mặc định: tất cả)")
+    suite_parser.add_argument("--modes", nargs="*", choices=MODES, default=list(MODES))
+    suite_parser.add_argument("--repeat", type=int, default=1, help="số lần đo, lấy lần nhanh nhất")
+    suite_parser.add_argument("--max-seconds", type=float, default=5.0,
+                              help="bỏ các N lớn hơn khi một lần đo vượt quá số giây này")
+    suite_parser.add_argument("--no-tracemalloc", action="store_true", help="không đo bộ nhớ đỉnh")
+    suite_parser.add_argument("--json", help="ghi kết quả ra file JSON")
+    suite_parser.add_argument("--baseline", help="file JSON baseline để so sánh")
+    suite_parser.add_argument("--max-slowdown", type=float, default=0.25,
+                              help="tỉ lệ chậm đi tối đa cho phép (0.25 = 25%%)")
+    suite_parser.add_argument("--min-seconds", type=float, default=0.01,
+                              help="bỏ qua các trường hợp baseline nhanh hơn số giây này khi so sánh")
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        run_benchmark(args.n_min, args.n_max)
+        return 0
+    if args.command == "overhead":
+        instrumentation_overhead(args.n_min, args.n_max)
+        return 0
+
+    report = run_suite(args.n_min, args.n_max, args.engines, args.modes, args.repeat,
+                       args.max_seconds, not args.no_tracemalloc)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = compare_with_baseline(report, baseline, args.max_slowdown, args.min_seconds)
+        for regression in regressions:
+            engine, mode, num_queens = regression["case"]
+            print(f"HOI QUY: {engine}/{mode} N={num_queens}: {regression['baseline']:.4f}s -> "
+                  f"{regression['seconds']:.4f}s ({regression['ratio']:.2f}x)")
+        if regressions:
+            return 1
+        print("Không có hồi quy hiệu năng.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
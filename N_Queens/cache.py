@@ -0,0 +1,170 @@
+# Bộ nhớ đệm kết quả cho solve()/count(), lưu trên đĩa và trong tiến trình.
+#
+# Khóa gồm (N, chế độ, các quân hậu đặt sẵn, phiên bản engine). Mỗi kết quả là
+# một file JSON trong thư mục cache; file được ghi ra file tạm rồi os.replace
+# nên nhiều tiến trình ghi cùng lúc không làm hỏng cache. Tổng dung lượng bị
+# giới hạn, file ít được dùng nhất (mtime cũ nhất) bị xóa trước.
+import json
+import os
+from collections import OrderedDict
+
+from engines import DEFAULT_ENGINE, ENGINE_VERSION, count, solve
+
+# Số lời giải đã biết (OEIS A000170), count(n) với n <= 27 trả về ngay
+KNOWN_COUNTS = [
+    1, 1, 0, 0, 2, 10, 4, 40, 92, 352, 724, 2680, 14200, 73712, 365596,
+    2279184, 14772512, 95815104, 666090624, 4968057848, 39029188884,
+    314666222712, 2691008701644, 24233937684440, 227514171973736,
+    2207893435808352, 22317699616364044, 234907967154122528,
+]
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MEMO_SIZE = 128
+
+# Bản sao của một kết quả (số, hoặc danh sách lời giải): memo giữ bản riêng nên
+# người gọi sửa kết quả (sort, append, ...) không làm hỏng các lần tra sau
+def _copy(value):
+    if isinstance(value, list):
+        return [item.copy() if isinstance(item, list) else item for item in value]
+    return value
+
+def default_cache_dir():
+    return os.environ.get("NQUEENS_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "nqueens")
+
+class ResultCache:
+    """Cache hai tầng: memo LRU trong tiến trình và thư mục JSON trên đĩa."""
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES, memo_size=DEFAULT_MEMO_SIZE):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.memo_size = memo_size
+        self.memo = OrderedDict()
+        os.makedirs(self.directory, exist_ok=True)
+
+    # Khóa chuẩn hóa: các quân hậu đặt sẵn được sắp xếp để thứ tự nhập không quan trọng
+    @staticmethod
+    def make_key(num_queens, mode, fixed=()):
+        fixed = tuple(sorted((int(row), int(col)) for row, col in fixed))
+        return (num_queens, mode, fixed, ENGINE_VERSION)
+
+    def _path(self, key):
+        # hashlib chỉ cần khi chạm tới đĩa; tra bảng KNOWN_COUNTS không phải nạp nó
+        import hashlib
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        return os.path.join(self.directory, f"{key[1]}-{key[0]}-{digest[:16]}.json")
+
+    def _remember(self, key, value):
+        self.memo[key] = value
+        self.memo.move_to_end(key)
+        while len(self.memo) > self.memo_size:
+            self.memo.popitem(last=False)
+
+    _MISSING = object()
+
+    def get(self, key, default=None):
+        if key in self.memo:
+            self.memo.move_to_end(key)
+            return _copy(self.memo[key])
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as file:
+                entry = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            # File có thể vừa bị tiến trình khác xóa
+            return default
+        # Hai khóa khác nhau trùng tiền tố hash: coi như không có trong cache
+        if entry.get("key") != json.loads(json.dumps(key)):
+            return default
+        try:
+            # Cập nhật mtime để đánh dấu vừa được dùng (cho việc loại bỏ LRU)
+            os.utime(path)
+        except OSError:
+            # Thư mục cache chỉ đọc hoặc file vừa bị xóa: kết quả vẫn dùng được
+            pass
+        self._remember(key, entry["value"])
+        return _copy(entry["value"])
+
+    def put(self, key, value):
+        # tempfile chỉ cần khi ghi; không import sẵn để các lần tra cache/bảng khởi động nhanh
+        import tempfile
+        self._remember(key, _copy(value))
+        data = json.dumps({"key": key, "value": value}, separators=(",", ":"))
+        handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "w", encoding="utf-8") as file:
+                file.write(data)
+            os.replace(temp_path, self._path(key))
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self.evict()
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key, self._MISSING)
+        if value is self._MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    # Xóa các file cũ nhất cho tới khi tổng dung lượng không vượt quá max_bytes
+    def evict(self):
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        self.memo.clear()
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith((".json", ".tmp")):
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
+
+_default_cache = None
+
+def get_default_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResultCache()
+    return _default_cache
+
+# count() có cache; không có quân hậu đặt sẵn và n <= 27 thì tra bảng
+def cached_count(num_queens, fixed=(), cache=None):
+    if not fixed and 0 <= num_queens < len(KNOWN_COUNTS):
+        return KNOWN_COUNTS[num_queens]
+    cache = cache or get_default_cache()
+    key = cache.make_key(num_queens, "count", fixed)
+    if fixed:
+        from constrained import count_completions
+        return cache.get_or_compute(key, lambda: count_completions(num_queens, key[2]))
+    return cache.get_or_compute(key, lambda: count(num_queens))
+
+# solve() có cache; mọi engine cho cùng kết quả nên engine không nằm trong khóa
+def cached_solve(num_queens, engine=DEFAULT_ENGINE, fixed=(), cache=None):
+    cache = cache or get_default_cache()
+    key = cache.make_key(num_queens, "solve", fixed)
+    if fixed:
+        from constrained import complete
+        # Sắp xếp để cùng thứ tự từ điển với solve()
+        return cache.get_or_compute(key, lambda: sorted(complete(num_queens, key[2])))
+    return cache.get_or_compute(key, lambda: solve(num_queens, engine=engine))
@@ -0,0 +1,280 @@
+# Đếm số lời giải cho N lớn (chạy hàng giờ, hàng ngày) có checkpoint, chạy
+# tiếp được sau khi bị ngắt và chia được cho nhiều máy qua một thư mục chung.
+#
+# Không gian tìm kiếm được chia thành các đơn vị công việc cố định: mỗi đơn vị
+# là một tiền tố hợp lệ của `depth` hàng đầu (như parallel.py), chỉ lấy các
+# tiền tố có quân hậu hàng 0 ở nửa trái (và cột giữa với N lẻ); nửa trái được
+# nhân đôi khi ghép như count(). Đơn vị được đánh số theo thứ tự từ điển nên
+# mọi máy đều thấy cùng một danh sách.
+#
+# Thư mục công việc gồm:
+#   manifest.json                N, depth, số đơn vị và mã băm danh sách tiền tố
+#   journal-<máy>-<pid>.ndjson   mỗi dòng là một đơn vị đã xong và số lời giải
+#                                của nó; mỗi tiến trình chỉ ghi thêm vào file
+#                                riêng nên nhiều máy ghi cùng lúc không xung đột
+#   result.json                  kết quả sau khi merge và kiểm tra
+#
+# Cách chạy:
+#   python checkpoint.py init DIR --n 18 [--depth 3]
+#   python checkpoint.py plan DIR --hosts 4          # chia dải đơn vị cho 4 máy
+#   python checkpoint.py run DIR [--shard I/K | --units A:B] [--workers W]
+#   python checkpoint.py resume DIR [--workers W]    # chạy nốt mọi đơn vị còn thiếu
+#   python checkpoint.py status DIR
+#   python checkpoint.py merge DIR [--verify-sample K]
+import argparse
+import hashlib
+import json
+import os
+import random
+import socket
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from cache import KNOWN_COUNTS
+from parallel import count_prefix, default_workers, enumerate_prefixes
+
+MANIFEST = "manifest.json"
+RESULT = "result.json"
+JOURNAL_PREFIX = "journal-"
+DEFAULT_DEPTH = 3
+
+# Các đơn vị công việc (tiền tố) của bài toán, theo thứ tự từ điển
+def work_units(num_queens, depth=DEFAULT_DEPTH):
+    if num_queens <= 0:
+        return [()]
+    half = num_queens // 2
+    return [prefix for prefix in enumerate_prefixes(num_queens, max(depth, 1))
+            if prefix[0] < half or (num_queens % 2 == 1 and prefix[0] == half)]
+
+# Hệ số của một đơn vị khi ghép: nửa trái được nhân đôi (đối xứng gương)
+def unit_weight(num_queens, prefix):
+    if num_queens <= 0 or (num_queens % 2 == 1 and prefix[0] == num_queens // 2):
+        return 1
+    return 2
+
+# Số lời giải của một đơn vị (chạy trong tiến trình con)
+def count_unit(num_queens, prefix):
+    if num_queens < 0:
+        return 0
+    return count_prefix(num_queens, prefix)
+
+def _units_digest(units):
+    return hashlib.sha1(json.dumps(units).encode()).hexdigest()
+
+def _write_json(path, data):
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=2)
+    os.replace(temp_path, path)
+
+def init_job(directory, num_queens, depth=DEFAULT_DEPTH):
+    """Tạo thư mục công việc; gọi lại với cùng tham số thì không làm gì"""
+    units = [list(prefix) for prefix in work_units(num_queens, depth)]
+    manifest = {"n": num_queens, "depth": depth, "num_units": len(units), "units_sha1": _units_digest(units)}
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, MANIFEST)
+    if os.path.exists(path):
+        existing = load_manifest(directory)
+        if existing != manifest:
+            raise ValueError(f"{directory} đã có công việc khác: {existing}")
+        return existing
+    _write_json(path, manifest)
+    return manifest
+
+def load_manifest(directory):
+    try:
+        with open(os.path.join(directory, MANIFEST), encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        raise ValueError(f"{directory} chưa có công việc (chạy init trước)") from None
+
+def read_journal(directory):
+    """Mọi bản ghi đã xong, gộp từ các file journal của mọi máy.
+
+    Dòng cuối bị ghi dở (tiến trình chết giữa chừng) được bỏ qua.
+    """
+    records = []
+    for entry in sorted(os.scandir(directory), key=lambda entry: entry.name):
+        if not (entry.name.startswith(JOURNAL_PREFIX) and entry.name.endswith(".ndjson")):
+            continue
+        with open(entry.path, encoding="utf-8") as file:
+            for line in file:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    return records
+
+def completed_units(directory):
+    return {record["unit"] for record in read_journal(directory)}
+
+# Chọn dải đơn vị: "A:B" (nửa mở) hoặc shard "I/K" (dải thứ I trong K dải liền nhau)
+def select_units(num_units, units=None, shard=None):
+    if shard is not None:
+        index, total = (int(part) for part in shard.split("/"))
+        if not 0 <= index < total:
+            raise ValueError(f"Shard không hợp lệ: {shard!r}")
+        return range(index * num_units // total, (index + 1) * num_units // total)
+    if units is not None:
+        start, _, stop = units.partition(":")
+        return range(int(start or 0), min(int(stop or num_units), num_units))
+    return range(num_units)
+
+def plan_shards(directory, hosts):
+    """Các dải đơn vị rời nhau cho từng máy"""
+    num_units = load_manifest(directory)["num_units"]
+    return [select_units(num_units, shard=f"{index}/{hosts}") for index in range(hosts)]
+
+def run_units(directory, units=None, shard=None, workers=1, host=None, max_units=None, verbose=True):
+    """Đếm các đơn vị chưa xong trong dải đã chọn và ghi từng kết quả vào journal.
+
+    Mỗi đơn vị được ghi (flush + fsync) ngay khi xong nên bị ngắt lúc nào cũng
+    chỉ mất các đơn vị đang chạy. max_units: dừng sau số đơn vị này (chạy theo
+    từng đợt có giới hạn thời gian). Trả về số đơn vị đã đếm trong lần chạy này.
+    """
+    manifest = load_manifest(directory)
+    num_queens = manifest["n"]
+    all_units = work_units(num_queens, manifest["depth"])
+    if _units_digest([list(prefix) for prefix in all_units]) != manifest["units_sha1"]:
+        raise ValueError("Danh sách đơn vị không khớp manifest (phiên bản mã khác?)")
+    done = completed_units(directory)
+    pending = [unit for unit in select_units(len(all_units), units, shard) if unit not in done]
+    if max_units is not None:
+        pending = pending[:max_units]
+    if not pending:
+        return 0
+
+    host = host or socket.gethostname()
+    journal_path = os.path.join(directory, f"{JOURNAL_PREFIX}{host}-{os.getpid()}.ndjson")
+    finished = 0
+    with open(journal_path, "a", encoding="utf-8") as journal:
+
+        def record(unit, count, seconds):
+            nonlocal finished
+            journal.write(json.dumps({"unit": unit, "prefix": list(all_units[unit]), "count": count,
+                                      "seconds": round(seconds, 3), "host": host}) + "\n")
+            journal.flush()
+            os.fsync(journal.fileno())
+            finished += 1
+            if verbose:
+                print(f"Don vi {unit} {list(all_units[unit])}: {count} loi giai ({seconds:.2f}s) "
+                      f"[{finished}/{len(pending)}]")
+
+        workers = workers or default_workers()
+        if workers == 1:
+            for unit in pending:
+                start = time.perf_counter()
+                count = count_unit(num_queens, all_units[unit])
+                record(unit, count, time.perf_counter() - start)
+            return finished
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Giữ tối đa 2 * workers đơn vị đang chạy; ghi journal theo thứ tự xong
+            queue = iter(pending)
+            running = {}
+
+            def submit_next():
+                unit = next(queue, None)
+                if unit is not None:
+                    running[executor.submit(count_unit, num_queens, all_units[unit])] = (unit, time.perf_counter())
+
+            for _ in range(workers * 2):
+                submit_next()
+            while running:
+                done_futures, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done_futures:
+                    unit, start = running.pop(future)
+                    record(unit, future.result(), time.perf_counter() - start)
+                    submit_next()
+    return finished
+
+def job_status(directory):
+    manifest = load_manifest(directory)
+    done = completed_units(directory)
+    return {"n": manifest["n"], "depth": manifest["depth"], "num_units": manifest["num_units"],
+            "completed": len(done), "remaining": manifest["num_units"] - len(done)}
+
+def merge_results(directory, verify_sample=0, seed=None):
+    """Ghép kết quả các đơn vị, kiểm tra và ghi result.json.
+
+    Kiểm tra: đủ mọi đơn vị, tiền tố khớp manifest, các bản ghi trùng (một
+    đơn vị chạy hai lần) cho cùng số lời giải, tổng khớp OEIS A000170 nếu đã
+    biết, và đếm lại verify_sample đơn vị ngẫu nhiên. Sai thì báo ValueError.
+    """
+    manifest = load_manifest(directory)
+    num_queens = manifest["n"]
+    all_units = work_units(num_queens, manifest["depth"])
+    counts = {}
+    for record in read_journal(directory):
+        unit = record["unit"]
+        if not 0 <= unit < len(all_units) or tuple(record["prefix"]) != all_units[unit]:
+            raise ValueError(f"Bản ghi không khớp manifest: {record}")
+        if counts.setdefault(unit, record["count"]) != record["count"]:
+            raise ValueError(f"Đơn vị {unit} có hai kết quả khác nhau: {counts[unit]} và {record['count']}")
+    missing = [unit for unit in range(len(all_units)) if unit not in counts]
+    if missing:
+        raise ValueError(f"Còn thiếu {len(missing)} đơn vị (ví dụ {missing[:5]}); chạy resume trước khi merge")
+    rand = random.Random(seed)
+    for unit in rand.sample(range(len(all_units)), min(verify_sample, len(all_units))):
+        if count_unit(num_queens, all_units[unit]) != counts[unit]:
+            raise ValueError(f"Đếm lại đơn vị {unit} cho kết quả khác journal")
+    total = sum(unit_weight(num_queens, all_units[unit]) * counts[unit] for unit in range(len(all_units)))
+    if 0 <= num_queens < len(KNOWN_COUNTS) and total != KNOWN_COUNTS[num_queens]:
+        raise ValueError(f"Tổng {total} khác số đã biết {KNOWN_COUNTS[num_queens]} với N={num_queens}")
+    result = {"n": num_queens, "depth": manifest["depth"], "num_units": len(all_units), "count": total,
+              "verified_sample": verify_sample}
+    _write_json(os.path.join(directory, RESULT), result)
+    return result
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Đếm N quân hậu có checkpoint, chia việc cho nhiều máy")
+    commands = parser.add_subparsers(dest="command", required=True)
+    init_parser = commands.add_parser("init", help="tạo thư mục công việc")
+    init_parser.add_argument("directory")
+    init_parser.add_argument("--n", type=int, required=True, help="số quân hậu")
+    init_parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH, help="số hàng của mỗi tiền tố")
+    plan_parser = commands.add_parser("plan", help="chia dải đơn vị cho nhiều máy")
+    plan_parser.add_argument("directory")
+    plan_parser.add_argument("--hosts", type=int, required=True)
+    for name, help_text in (("run", "đếm các đơn vị trong một dải"), ("resume", "đếm mọi đơn vị còn thiếu")):
+        run_parser = commands.add_parser(name, help=help_text)
+        run_parser.add_argument("directory")
+        run_parser.add_argument("--workers", type=int, default=1, help="số tiến trình (0 = số CPU)")
+        run_parser.add_argument("--host", default=None, help="tên máy ghi vào journal")
+        run_parser.add_argument("--max-units", type=int, default=None, help="dừng sau số đơn vị này")
+        if name == "run":
+            run_parser.add_argument("--units", default=None, metavar="A:B", help="dải đơn vị [A, B)")
+            run_parser.add_argument("--shard", default=None, metavar="I/K", help="dải thứ I trong K dải")
+    status_parser = commands.add_parser("status", help="số đơn vị đã xong / còn lại")
+    status_parser.add_argument("directory")
+    merge_parser = commands.add_parser("merge", help="ghép và kiểm tra kết quả")
+    merge_parser.add_argument("directory")
+    merge_parser.add_argument("--verify-sample", type=int, default=0, help="đếm lại K đơn vị ngẫu nhiên")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "init":
+            manifest = init_job(args.directory, args.n, args.depth)
+            print(f"Cong viec N={manifest['n']}: {manifest['num_units']} don vi (depth {manifest['depth']})")
+        elif args.command == "plan":
+            for index, units in enumerate(plan_shards(args.directory, args.hosts)):
+                print(f"may {index}: --shard {index}/{args.hosts}  (--units {units.start}:{units.stop})")
+        elif args.command in ("run", "resume"):
+            try:
+                finished = run_units(args.directory, getattr(args, "units", None), getattr(args, "shard", None),
+                                     args.workers or None, args.host, args.max_units)
+            except KeyboardInterrupt:
+                print("Da dung; chay 'resume' de tiep tuc.")
+                sys.exit(130)
+            status = job_status(args.directory)
+            print(f"Da dem {finished} don vi; con lai {status['remaining']}/{status['num_units']}.")
+        elif args.command == "status":
+            status = job_status(args.directory)
+            print(f"N={status['n']}: xong {status['completed']}/{status['num_units']}, con lai {status['remaining']}")
+        else:
+            result = merge_results(args.directory, args.verify_sample)
+            print(f"=> Tong so loi giai tim duoc: {result['count']}")
+    except ValueError as e:
+        print(f"Lỗi: {e}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,225 @@
+# Hoàn thành một bàn cờ đặt dở: một số quân hậu cố định ở (row, col) bất kỳ và
+# một số ô bị cấm đặt.
+#
+# Ràng buộc của các quân cố định được đưa thẳng vào các mặt nạ bit ban đầu:
+#   cols  bit c          : cột c đã có quân hậu
+#   diag1 bit (r + c)    : đường chéo xuống-trái đã có quân hậu
+#   diag2 bit (c - r + n - 1): đường chéo xuống-phải đã có quân hậu
+# Các cột còn trống ở hàng r là
+#   full & ~(cols | blocked[r] | diag1 >> r | diag2 >> (n - 1 - r)).
+# Thay vì luôn đặt hàng kế tiếp, mỗi bước chọn hàng còn ít ứng viên nhất (MRV)
+# nên các bài toán bị ràng buộc nhiều kết thúc rất nhanh. Thứ tự lời giải vì
+# vậy không theo thứ tự từ điển như solve().
+#
+# Cách chạy:  python constrained.py N --fix R,C ... --block R,C ...
+import argparse
+
+# Đọc tham số ô cấm thành danh sách ô (row, col). `blocked` có thể là
+#   - một tập/danh sách các ô (row, col), giống tham số `fixed`
+#   - một lưới n x n kiểu bool: mảng NumPy dtype bool, hoặc danh sách các hàng
+#     chỉ gồm True/False
+# Dạng khác (ví dụ lưới số 0/1, cặp không phải số nguyên) bị từ chối thay vì
+# đoán, vì một danh sách cặp ô và một lưới 2 x 2 trông giống nhau.
+def _blocked_cells(num_queens, blocked):
+    if hasattr(blocked, "dtype"):
+        if blocked.dtype == bool:
+            if blocked.shape != (num_queens, num_queens):
+                raise ValueError(f"Lưới ô cấm phải có kích thước {num_queens}x{num_queens}, "
+                                 f"nhận được {blocked.shape}")
+            return [(r, c) for r, row in enumerate(blocked.tolist()) for c, cell in enumerate(row) if cell]
+        blocked = blocked.tolist()
+    items = list(blocked)
+    if items and all(isinstance(row, (list, tuple)) and row and all(isinstance(cell, bool) for cell in row)
+                     for row in items):
+        if len(items) != num_queens or any(len(row) != num_queens for row in items):
+            raise ValueError(f"Lưới ô cấm phải có kích thước {num_queens}x{num_queens}")
+        return [(r, c) for r, row in enumerate(items) for c, cell in enumerate(row) if cell]
+    cells = []
+    for item in items:
+        if not (isinstance(item, (list, tuple)) and len(item) == 2
+                and all(isinstance(v, int) and not isinstance(v, bool) for v in item)):
+            raise ValueError(f"Ô cấm không hợp lệ: {item!r} (cần cặp (hàng, cột) hoặc lưới bool n x n)")
+        cells.append((item[0], item[1]))
+    return cells
+
+# Chuyển các ô cấm (xem _blocked_cells) thành danh sách mặt nạ bit theo hàng
+def blocked_rows(num_queens, blocked=None):
+    rows = [0] * num_queens
+    if blocked is None:
+        return rows
+    for r, c in _blocked_cells(num_queens, blocked):
+        if not (0 <= r < num_queens and 0 <= c < num_queens):
+            raise ValueError(f"Ô cấm ({r}, {c}) nằm ngoài bàn cờ {num_queens}x{num_queens}")
+        rows[r] |= 1 << c
+    return rows
+
+# Trạng thái ban đầu sau khi đặt các quân cố định, hoặc lý do vô nghiệm
+def _initial_state(num_queens, fixed, blocked):
+    board = [-1] * num_queens
+    cols = diag1 = diag2 = 0
+    for r, c in fixed:
+        if not (0 <= r < num_queens and 0 <= c < num_queens):
+            raise ValueError(f"Quân hậu ({r}, {c}) nằm ngoài bàn cờ {num_queens}x{num_queens}")
+        if board[r] == c:
+            continue
+        bit = 1 << c
+        if board[r] >= 0:
+            return None, f"hai quân hậu cố định cùng hàng {r}"
+        if cols & bit:
+            return None, f"hai quân hậu cố định cùng cột {c}"
+        if diag1 >> (r + c) & 1 or diag2 >> (c - r + num_queens - 1) & 1:
+            return None, f"quân hậu cố định ({r}, {c}) nằm trên đường chéo của quân khác"
+        if blocked[r] & bit:
+            return None, f"quân hậu cố định ({r}, {c}) nằm trên ô cấm"
+        board[r] = c
+        cols |= bit
+        diag1 |= 1 << (r + c)
+        diag2 |= 1 << (c - r + num_queens - 1)
+    return (board, cols, diag1, diag2), None
+
+# Các cột còn đặt được ở hàng r
+def _row_candidates(r, cols, diag1, diag2, blocked, num_queens, full):
+    return full & ~(cols | blocked[r] | diag1 >> r | diag2 >> (num_queens - 1 - r))
+
+# Hàng trống có ít ứng viên nhất; None nếu chắc chắn vô nghiệm (một hàng hoặc
+# một cột còn trống không còn chỗ đặt)
+def _most_constrained(board, cols, diag1, diag2, blocked, num_queens, full):
+    best_row = -1
+    best_candidates = 0
+    best_size = num_queens + 1
+    reachable = cols
+    for r in range(num_queens):
+        if board[r] >= 0:
+            continue
+        candidates = _row_candidates(r, cols, diag1, diag2, blocked, num_queens, full)
+        size = candidates.bit_count()
+        if size == 0:
+            return None
+        reachable |= candidates
+        if size < best_size:
+            best_row, best_candidates, best_size = r, candidates, size
+    if reachable != full:
+        return None
+    return best_row, best_candidates
+
+# Lý do bài toán chắc chắn vô nghiệm (kiểm tra trước khi tìm kiếm), hoặc None
+def infeasible_reason(num_queens, fixed=(), blocked=None):
+    if num_queens < 0:
+        return "số quân hậu âm"
+    rows = blocked_rows(num_queens, blocked)
+    initial, reason = _initial_state(num_queens, fixed, rows)
+    if reason:
+        return reason
+    board, cols, diag1, diag2 = initial
+    full = (1 << num_queens) - 1
+    for r in range(num_queens):
+        if board[r] < 0 and not _row_candidates(r, cols, diag1, diag2, rows, num_queens, full):
+            return f"hàng {r} không còn ô nào đặt được"
+    reachable = cols
+    for r in range(num_queens):
+        if board[r] < 0:
+            reachable |= _row_candidates(r, cols, diag1, diag2, rows, num_queens, full)
+    if reachable != full:
+        missing = (full & ~reachable).bit_length() - 1
+        return f"cột {missing} không còn ô nào đặt được"
+    return None
+
+def complete(num_queens, fixed=(), blocked=None, limit=None):
+    """Sinh lần lượt các cách hoàn thành bàn cờ (cols[row] = cột).
+
+    fixed: các quân hậu cố định (row, col); blocked: các ô cấm (xem _blocked_cells).
+    Bài toán vô nghiệm được phát hiện trước khi tìm kiếm và không sinh lời giải nào.
+    """
+    if num_queens < 0 or (limit is not None and limit <= 0):
+        return
+    fixed = list(fixed)
+    if infeasible_reason(num_queens, fixed, blocked):
+        return
+    rows = blocked_rows(num_queens, blocked)
+    (board, cols, diag1, diag2), _ = _initial_state(num_queens, fixed, rows)
+    full = (1 << num_queens) - 1
+    found = 0
+
+    def place(cols, diag1, diag2):
+        nonlocal found
+        if cols == full:
+            found += 1
+            yield board.copy()
+            return
+        choice = _most_constrained(board, cols, diag1, diag2, rows, num_queens, full)
+        if choice is None:
+            return
+        r, candidates = choice
+        while candidates:
+            bit = candidates & -candidates
+            candidates ^= bit
+            c = bit.bit_length() - 1
+            board[r] = c
+            yield from place(cols | bit, diag1 | 1 << (r + c), diag2 | 1 << (c - r + num_queens - 1))
+            board[r] = -1
+            if limit is not None and found >= limit:
+                return
+
+    yield from place(cols, diag1, diag2)
+
+# Đếm số cách hoàn thành bàn cờ
+def count_completions(num_queens, fixed=(), blocked=None):
+    return sum(1 for _ in complete(num_queens, fixed, blocked))
+
+# Chia bài toán thành các đơn vị độc lập theo đúng `depth` lựa chọn MRV đầu tiên
+# của complete(): mỗi đơn vị là danh sách quân cố định có thêm các quân đã chọn.
+# Ghép complete() của các đơn vị theo thứ tự cho đúng thứ tự của complete().
+def split_fixed(num_queens, fixed=(), blocked=None, depth=1):
+    fixed = tuple(fixed)
+    if num_queens < 0 or infeasible_reason(num_queens, fixed, blocked):
+        return []
+    rows = blocked_rows(num_queens, blocked)
+    (board, cols, diag1, diag2), _ = _initial_state(num_queens, fixed, rows)
+    full = (1 << num_queens) - 1
+    units = []
+    extra = []
+
+    def extend(cols, diag1, diag2, depth):
+        if depth == 0 or cols == full:
+            units.append(fixed + tuple(extra))
+            return
+        choice = _most_constrained(board, cols, diag1, diag2, rows, num_queens, full)
+        if choice is None:
+            return
+        r, candidates = choice
+        while candidates:
+            bit = candidates & -candidates
+            candidates ^= bit
+            c = bit.bit_length() - 1
+            board[r] = c
+            extra.append((r, c))
+            extend(cols | bit, diag1 | 1 << (r + c), diag2 | 1 << (c - r + num_queens - 1), depth - 1)
+            extra.pop()
+            board[r] = -1
+
+    extend(cols, diag1, diag2, depth)
+    return units
+
+# Đọc ô "R,C" từ dòng lệnh
+def parse_cell(text):
+    row, col = text.split(",")
+    return int(row), int(col)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hoàn thành bàn cờ N quân hậu đặt dở")
+    parser.add_argument("num_queens", type=int, help="số quân hậu")
+    parser.add_argument("--fix", type=parse_cell, action="append", default=[], metavar="R,C",
+                        help="quân hậu cố định tại hàng R, cột C (lặp lại được)")
+    parser.add_argument("--block", type=parse_cell, action="append", default=[], metavar="R,C",
+                        help="ô cấm tại hàng R, cột C (lặp lại được)")
+    parser.add_argument("--limit", type=int, default=None, help="số lời giải tối đa")
+    args = parser.parse_args()
+
+    reason = infeasible_reason(args.num_queens, args.fix, set(args.block))
+    if reason:
+        print(f"Vô nghiệm: {reason}")
+    else:
+        index = 0
+        for index, solution in enumerate(complete(args.num_queens, args.fix, set(args.block), args.limit), 1):
+            print(f"Loi giai {index}: {solution}")
+        print(f"=> Tong so loi giai tim duoc: {index}")
@@ -0,0 +1,245 @@
+# Engine exact cover: Algorithm X với Dancing Links (Knuth) cho bài toán đặt quân hậu.
+#
+# Mỗi ô (r, c) của bàn cờ là một lựa chọn (option). Các hàng R0..Rn-1 và cột
+# C0..Cn-1 là ràng buộc chính (phải được phủ đúng một lần); các đường chéo là
+# ràng buộc phụ (được phủ tối đa một lần). Chỉ cần thay bộ ràng buộc là cùng
+# một engine giải được các biến thể:
+#   - "standard": hậu thường, đường chéo r + c và r - c
+#   - "toroidal": bàn cờ hình xuyến, đường chéo (r + c) mod n và (r - c) mod n
+#   - "superqueen": hậu thường kết hợp nước đi của mã (mỗi cặp ô cách nhau
+#     một nước mã là một ràng buộc phụ)
+#   - holes: các ô bị khoét (không có lựa chọn tương ứng), dùng với mọi biến thể
+#
+# Cách chạy:  python dlx.py N [--variant standard|toroidal|superqueen] [--hole R,C ...]
+import argparse
+
+from constrained import parse_cell
+
+VARIANTS = ("standard", "toroidal", "superqueen")
+KNIGHT_MOVES = ((1, 2), (2, 1), (1, -2), (2, -1))
+
+class DancingLinks:
+    """Ma trận exact cover thưa dưới dạng danh sách liên kết đôi bốn chiều."""
+
+    def __init__(self, num_primary, num_secondary, options):
+        num_items = num_primary + num_secondary
+        self.root = root = num_items
+        # Nút 0..num_items-1 là đầu mục, nút num_items là gốc, sau đó là các nút của lựa chọn
+        size = num_items + 1
+        self.left = list(range(size))
+        self.right = list(range(size))
+        self.up = list(range(size))
+        self.down = list(range(size))
+        self.item = list(range(size))
+        self.option = [-1] * size
+        self.count = [0] * num_items
+        # first_node[option_id]: nút đầu tiên trong vòng của lựa chọn
+        self.first_node = []
+
+        # Chỉ các mục chính nằm trong danh sách của gốc; mục phụ tự liên kết với chính nó
+        previous = root
+        for i in range(num_primary):
+            self.left[i] = previous
+            self.right[previous] = i
+            previous = i
+        self.left[root] = previous
+        self.right[previous] = root
+
+        for option_id, items in enumerate(options):
+            first = None
+            for i in items:
+                node = len(self.item)
+                self.item.append(i)
+                self.option.append(option_id)
+                # Thêm vào cuối cột của mục i
+                self.up.append(self.up[i])
+                self.down.append(i)
+                self.down[self.up[i]] = node
+                self.up[i] = node
+                self.count[i] += 1
+                # Thêm vào cuối vòng của lựa chọn
+                if first is None:
+                    first = node
+                    self.first_node.append(node)
+                    self.left.append(node)
+                    self.right.append(node)
+                else:
+                    self.left.append(self.left[first])
+                    self.right.append(first)
+                    self.right[self.left[first]] = node
+                    self.left[first] = node
+
+    def cover(self, i):
+        left, right, up, down, item, count = self.left, self.right, self.up, self.down, self.item, self.count
+        right[left[i]] = right[i]
+        left[right[i]] = left[i]
+        row = down[i]
+        while row != i:
+            node = right[row]
+            while node != row:
+                up[down[node]] = up[node]
+                down[up[node]] = down[node]
+                count[item[node]] -= 1
+                node = right[node]
+            row = down[row]
+
+    def uncover(self, i):
+        left, right, up, down, item, count = self.left, self.right, self.up, self.down, self.item, self.count
+        row = up[i]
+        while row != i:
+            node = left[row]
+            while node != row:
+                count[item[node]] += 1
+                up[down[node]] = node
+                down[up[node]] = node
+                node = left[node]
+            row = up[row]
+        right[left[i]] = i
+        left[right[i]] = i
+
+    # Lựa chọn còn dùng được: mọi nút của nó vẫn nằm trong cột tương ứng
+    def available(self, option_id):
+        node = self.first_node[option_id]
+        other = node
+        while True:
+            if self.down[self.up[other]] != other:
+                return False
+            other = self.right[other]
+            if other == node:
+                return True
+
+    # Chọn trước một lựa chọn (dùng cho các quân hậu đã đặt sẵn)
+    def select(self, option_id):
+        node = self.first_node[option_id]
+        self.cover(self.item[node])
+        other = self.right[node]
+        while other != node:
+            self.cover(self.item[other])
+            other = self.right[other]
+
+    def search(self, heuristic="mrv"):
+        """Sinh lần lượt các tập lựa chọn phủ đúng mọi mục chính.
+
+        heuristic "mrv" chọn mục chính có ít lựa chọn nhất; "first" chọn mục
+        chính đầu tiên (với bài toán quân hậu là hàng nhỏ nhất chưa đặt).
+        """
+        root, right, down, item, count = self.root, self.right, self.down, self.item, self.count
+        chosen = []
+
+        def solve():
+            if right[root] == root:
+                yield chosen.copy()
+                return
+            best = right[root]
+            if heuristic == "mrv":
+                i = right[best]
+                while i != root and count[best] > 0:
+                    if count[i] < count[best]:
+                        best = i
+                    i = right[i]
+            if count[best] == 0:
+                return
+            self.cover(best)
+            row = down[best]
+            while row != best:
+                chosen.append(self.option[row])
+                node = right[row]
+                while node != row:
+                    self.cover(item[node])
+                    node = right[node]
+                yield from solve()
+                node = self.left[row]
+                while node != row:
+                    self.uncover(item[node])
+                    node = self.left[node]
+                chosen.pop()
+                row = down[row]
+            self.uncover(best)
+
+        yield from solve()
+
+# Dựng bài toán exact cover cho một biến thể: trả về (số mục chính, số mục phụ,
+# danh sách lựa chọn, ô tương ứng với từng lựa chọn)
+def queens_problem(num_queens, variant="standard", holes=()):
+    if variant not in VARIANTS:
+        raise ValueError(f"Biến thể không hợp lệ: {variant!r} (chọn một trong {list(VARIANTS)})")
+    n = num_queens
+    holes = set(holes)
+    num_primary = 2 * n
+    # Mục phụ: đường chéo (2n - 1 mỗi chiều, hoặc n với bàn xuyến)
+    diagonals = n if variant == "toroidal" else max(2 * n - 1, 0)
+    secondary = 2 * diagonals
+    knight_items = {}
+    if variant == "superqueen":
+        for r in range(n):
+            for c in range(n):
+                for dr, dc in KNIGHT_MOVES:
+                    if 0 <= r + dr < n and 0 <= c + dc < n:
+                        knight_items[(r, c, r + dr, c + dc)] = num_primary + secondary + len(knight_items)
+    options = []
+    cells = []
+    for r in range(n):
+        for c in range(n):
+            if (r, c) in holes:
+                continue
+            if variant == "toroidal":
+                d1, d2 = (r + c) % n, (r - c) % n
+            else:
+                d1, d2 = r + c, r - c + n - 1
+            items = [r, n + c, num_primary + d1, num_primary + diagonals + d2]
+            if knight_items:
+                for dr, dc in KNIGHT_MOVES:
+                    for key in ((r, c, r + dr, c + dc), (r - dr, c - dc, r, c)):
+                        if key in knight_items:
+                            items.append(knight_items[key])
+            options.append(items)
+            cells.append((r, c))
+    return num_primary, secondary + len(knight_items), options, cells
+
+# Sinh các lời giải (cols[row] = cột) của một biến thể bằng DLX
+def dlx_solutions(num_queens, variant="standard", holes=(), heuristic="mrv", prefix=()):
+    if num_queens < 0:
+        return
+    num_primary, num_secondary, options, cells = queens_problem(num_queens, variant, holes)
+    links = DancingLinks(num_primary, num_secondary, options)
+    option_of = {cell: option_id for option_id, cell in enumerate(cells)}
+    preset = []
+    for row, col in enumerate(prefix):
+        option_id = option_of.get((row, col))
+        if option_id is None:
+            return
+        # Lựa chọn xung đột với quân đặt trước đã bị gỡ khỏi cột của ít nhất một mục
+        if not links.available(option_id):
+            return
+        links.select(option_id)
+        preset.append(option_id)
+    for chosen in links.search(heuristic):
+        board = [0] * num_queens
+        for option_id in preset + chosen:
+            row, col = cells[option_id]
+            board[row] = col
+        yield board
+
+# Engine cho solve(): cùng chữ ký và cùng thứ tự kết quả với các engine quay lui
+def search_dlx(state, solutions, num_queens):
+    solutions.extend(sorted(dlx_solutions(num_queens, prefix=state)))
+
+def count_dlx(num_queens, variant="standard", holes=()):
+    return sum(1 for _ in dlx_solutions(num_queens, variant, holes))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Giải các biến thể N quân hậu bằng Dancing Links")
+    parser.add_argument("num_queens", type=int, help="số quân hậu")
+    parser.add_argument("--variant", choices=VARIANTS, default="standard")
+    parser.add_argument("--hole", type=parse_cell, action="append", default=[], metavar="R,C",
+                        help="ô bị khoét tại hàng R, cột C (lặp lại được)")
+    parser.add_argument("--count", action="store_true", help="chỉ đếm số lời giải")
+    args = parser.parse_args()
+
+    if args.count:
+        print(f"=> Tong so loi giai tim duoc: {count_dlx(args.num_queens, args.variant, args.hole)}")
+    else:
+        index = 0
+        for index, solution in enumerate(dlx_solutions(args.num_queens, args.variant, args.hole), 1):
+            print(f"Loi giai {index}: {solution}")
+        print(f"=> Tong so loi giai tim duoc: {index}")
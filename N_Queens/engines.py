@@ -0,0 +1,246 @@
+# Các engine tìm kiếm quay lui cho bài toán N quân hậu.
+#
+# Mỗi engine có cùng chữ ký search(state, solutions, num_queens) và trả về
+# các lời giải theo cùng một thứ tự (cột tăng dần ở mỗi hàng), nên có thể
+# thay thế cho nhau thông qua tham số `engine` của solve().
+#
+# dlx.py và stats.py chỉ được import khi cần (engine dlx, hoặc khi có `stats`)
+# để các lệnh chỉ đếm/tra bảng khởi động nhanh.
+
+# Hàm kiểm tra xem đã tìm được một lời giải hợp lệ chưa
+def is_valid_state(state, num_queens):
+    # Một lời giải hợp lệ khi đã đặt đủ số quân hậu
+    return len(state) == num_queens
+
+# Hàm lấy các vị trí (cột) ứng viên cho hàng tiếp theo
+def get_candidates(state, num_queens):
+    # Nếu chưa có quân hậu nào, tất cả các cột đều là ứng viên
+    if not state:
+        return range(num_queens)
+
+    # Vị trí (hàng) hiện tại đang cần đặt quân hậu
+    position = len(state)
+    # Bắt đầu với tất cả các cột có thể
+    candidates = set(range(num_queens))
+
+    # Lặp qua các quân hậu đã đặt để loại bỏ các vị trí bị tấn công
+    for row, col in enumerate(state):
+        # 1. Loại bỏ cột đã có quân hậu (tấn công theo chiều dọc)
+        candidates.discard(col)
+
+        # 2. Loại bỏ các vị trí bị tấn công theo đường chéo
+        # Tính khoảng cách hàng giữa vị trí hiện tại và quân hậu đã đặt
+        dist = position - row
+
+        # Loại bỏ vị trí trên đường chéo (xuống-phải)
+        candidates.discard(col + dist)
+        # Loại bỏ vị trí trên đường chéo (xuống-trái)
+        candidates.discard(col - dist)
+
+    return candidates
+
+# Engine gốc: tập ứng viên được dựng lại bằng set ở mỗi nút (O(n) mỗi nút)
+def search_set(state, solutions, num_queens):
+    # Nếu đã tìm thấy một lời giải hoàn chỉnh, thêm vào danh sách và dừng nhánh này
+    if is_valid_state(state, num_queens):
+        solutions.append(state.copy())
+        return
+
+    # Lặp qua các ứng viên hợp lệ cho hàng hiện tại
+    for candidate in get_candidates(state, num_queens):
+        # Đặt thử quân hậu vào vị trí ứng viên
+        state.append(candidate)
+        # Tiếp tục tìm kiếm cho hàng tiếp theo
+        search_set(state, solutions, num_queens)
+        # Quay lui (backtrack): gỡ quân hậu vừa đặt ra để thử phương án khác
+        state.pop()
+
+# Tính các mặt nạ bit (cột, chéo xuống-phải, chéo xuống-trái) cho hàng kế tiếp
+# từ một tiền tố đã đặt sẵn
+def prefix_masks(state, num_queens):
+    full = (1 << num_queens) - 1
+    cols = diag1 = diag2 = 0
+    for col in state:
+        bit = 1 << col
+        cols |= bit
+        diag1 = ((diag1 | bit) << 1) & full
+        diag2 = (diag2 | bit) >> 1
+    return cols, diag1, diag2
+
+# Engine bitmask: cột và hai đường chéo được lưu dưới dạng số nguyên,
+# mỗi bước lấy bit thấp nhất còn trống (tương đương cột nhỏ nhất)
+def search_bitmask(state, solutions, num_queens, masks=None):
+    if num_queens < 0:
+        return
+    full = (1 << num_queens) - 1
+    cols, diag1, diag2 = masks if masks is not None else prefix_masks(state, num_queens)
+
+    def place(cols, diag1, diag2):
+        # Đã đặt đủ quân hậu ở mọi cột
+        if cols == full:
+            solutions.append(state.copy())
+            return
+        # Các cột không bị tấn công ở hàng hiện tại
+        available = full & ~(cols | diag1 | diag2)
+        while available:
+            # Tách bit thấp nhất (cột nhỏ nhất còn trống)
+            bit = available & -available
+            available ^= bit
+            state.append(bit.bit_length() - 1)
+            # Chéo xuống-phải dịch trái, chéo xuống-trái dịch phải khi sang hàng mới
+            place(cols | bit, ((diag1 | bit) << 1) & full, (diag2 | bit) >> 1)
+            state.pop()
+
+    place(cols, diag1, diag2)
+
+# Đếm số cách hoàn thành bàn cờ từ các mặt nạ hiện tại, không lưu bàn cờ nào
+def count_from(cols, diag1, diag2, full):
+    if cols == full:
+        return 1
+    total = 0
+    available = full & ~(cols | diag1 | diag2)
+    while available:
+        bit = available & -available
+        available ^= bit
+        total += count_from(cols | bit, ((diag1 | bit) << 1) & full, (diag2 | bit) >> 1, full)
+    return total
+
+# Các cột của hàng đầu tiên mà count() duyệt, kèm hệ số nhân: mỗi lời giải có
+# quân hậu hàng 0 ở cột c tương ứng 1-1 với lời giải đối xứng gương ở cột
+# n-1-c, nên nửa trái được nhân đôi; với n lẻ, cột giữa được đếm một lần.
+# Dùng chung với bản có thống kê (stats.py) để hai bên duyệt cùng một cây.
+def half_board_columns(num_queens):
+    half = num_queens // 2
+    columns = [(col, 2) for col in range(half)]
+    if num_queens % 2 == 1:
+        columns.append((half, 1))
+    return columns
+
+# Đếm số lời giải mà không tạo danh sách lời giải, chỉ duyệt nửa trái bàn cờ
+# (xem half_board_columns).
+# Truyền `stats` (stats.SearchStats) để đếm nút trên cùng cây tìm kiếm.
+def count(num_queens, stats=None):
+    if stats is not None:
+        from stats import instrumented_search
+        return instrumented_search(num_queens, stats, mode="count")
+    if num_queens < 0:
+        return 0
+    if num_queens == 0:
+        return 1
+    full = (1 << num_queens) - 1
+    total = 0
+    for col, weight in half_board_columns(num_queens):
+        bit = 1 << col
+        total += weight * count_from(bit, (bit << 1) & full, bit >> 1, full)
+    return total
+
+# Sinh lần lượt các lời giải (generator) theo đúng thứ tự của solve().
+# Dùng ngăn xếp tường minh thay cho đệ quy nên bộ nhớ luôn là O(n) dù có bao
+# nhiêu lời giải; người dùng có thể dừng bất cứ lúc nào.
+#   limit: số lời giải tối đa cần sinh (None = không giới hạn)
+#   start_prefix: tiếp tục từ nhánh có tiền tố này (bao gồm chính nhánh đó),
+#       tức là chỉ sinh các lời giải không nhỏ hơn tiền tố theo thứ tự từ điển
+def iter_solutions(num_queens, limit=None, start_prefix=None):
+    if num_queens < 0 or (limit is not None and limit <= 0):
+        return
+    if num_queens == 0:
+        yield []
+        return
+
+    full = (1 << num_queens) - 1
+    # Các mặt nạ và tập cột còn phải thử ở từng độ sâu (hàng)
+    cols = [0] * (num_queens + 1)
+    diag1 = [0] * (num_queens + 1)
+    diag2 = [0] * (num_queens + 1)
+    available = [0] * (num_queens + 1)
+    available[0] = full
+    state = []
+    depth = 0
+
+    # Đi theo tiền tố đã lưu: ở mỗi hàng bỏ qua các cột nhỏ hơn cột của tiền tố
+    for col in start_prefix or ():
+        if depth == num_queens:
+            break
+        available[depth] &= ~((1 << col) - 1)
+        bit = 1 << col
+        if not available[depth] & bit:
+            # Cột trong tiền tố không còn hợp lệ: tiếp tục từ các cột lớn hơn
+            break
+        available[depth] ^= bit
+        state.append(col)
+        cols[depth + 1] = cols[depth] | bit
+        diag1[depth + 1] = ((diag1[depth] | bit) << 1) & full
+        diag2[depth + 1] = (diag2[depth] | bit) >> 1
+        depth += 1
+        if cols[depth] == full:
+            # Tiền tố đã là một lời giải hoàn chỉnh
+            yield list(state)
+            if limit is not None:
+                limit -= 1
+                if limit == 0:
+                    return
+            state.pop()
+            depth -= 1
+            break
+        available[depth] = full & ~(cols[depth] | diag1[depth] | diag2[depth])
+
+    while depth >= 0:
+        candidates = available[depth]
+        if not candidates:
+            # Hết ứng viên ở hàng này: quay lui một hàng
+            depth -= 1
+            if state:
+                state.pop()
+            continue
+        bit = candidates & -candidates
+        available[depth] = candidates ^ bit
+        next_cols = cols[depth] | bit
+        state.append(bit.bit_length() - 1)
+        if next_cols == full:
+            yield list(state)
+            if limit is not None:
+                limit -= 1
+                if limit == 0:
+                    return
+            state.pop()
+            continue
+        depth += 1
+        cols[depth] = next_cols
+        diag1[depth] = ((diag1[depth - 1] | bit) << 1) & full
+        diag2[depth] = (diag2[depth - 1] | bit) >> 1
+        available[depth] = full & ~(next_cols | diag1[depth] | diag2[depth])
+
+# Engine exact cover (dlx.py), import khi được chọn
+def search_dlx(state, solutions, num_queens):
+    from dlx import search_dlx as search
+    search(state, solutions, num_queens)
+
+# Danh sách engine có thể chọn qua tên; "dlx" là engine exact cover (dlx.py)
+ENGINES = {
+    "set": search_set,
+    "bitmask": search_bitmask,
+    "dlx": search_dlx,
+}
+DEFAULT_ENGINE = "bitmask"
+# Tăng khi thay đổi thuật toán làm kết quả khác đi (vô hiệu hóa cache cũ)
+ENGINE_VERSION = 1
+
+# Hàm chính để giải bài toán.
+# Khi có `stats`, dùng bản có đếm của engine bitmask (stats.py); các engine khác
+# không có bản có đếm nên bị từ chối thay vì báo số liệu của engine khác.
+# Khi không có `stats`, engine chạy nguyên vẹn, không tốn thêm gì.
+def solve(num_queens, engine=DEFAULT_ENGINE, stats=None):
+    try:
+        search = ENGINES[engine]
+    except KeyError:
+        raise ValueError(f"Engine không hợp lệ: {engine!r} (chọn một trong {sorted(ENGINES)})") from None
+    solutions = []
+    if stats is not None:
+        if engine != "bitmask":
+            raise ValueError(f"Thống kê tìm kiếm chỉ hỗ trợ engine bitmask, không hỗ trợ {engine!r}")
+        from stats import instrumented_search
+        instrumented_search(num_queens, stats, mode="all", solutions=solutions)
+        return solutions
+    state = []
+    search(state, solutions, num_queens)
+    return solutions
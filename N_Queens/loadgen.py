@@ -0,0 +1,183 @@
+# Bộ sinh tải cho server.py: nhiều client asyncio gửi yêu cầu song song trên
+# các kết nối keep-alive, rồi báo thông lượng và độ trễ p50/p90/p99.
+#
+# Cách chạy:
+#   python loadgen.py --spawn --requests 2000 --concurrency 32 --path "/count?n=11&fix=0,1"
+#   python loadgen.py --port 8765 --path "/solve?n=10" --path "/count?n=12"
+#   python loadgen.py --unix /tmp/nqueens.sock --requests 500
+# --spawn chạy máy chủ ngay trong tiến trình này trên một cổng tạm, nên có thể
+# đo hoàn toàn trên localhost mà không cần khởi động server.py riêng.
+import argparse
+import asyncio
+import json
+import math
+import time
+
+DEFAULT_PATHS = ("/count?n=10&fix=0,1",)
+
+class HTTPClient:
+    """Một kết nối HTTP/1.1 keep-alive tối giản (chỉ GET)"""
+
+    def __init__(self, host="127.0.0.1", port=None, unix_path=None):
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self.reader = None
+        self.writer = None
+
+    async def connect(self):
+        if self.unix_path:
+            self.reader, self.writer = await asyncio.open_unix_connection(self.unix_path)
+        else:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+            self.writer = None
+
+    async def get(self, path):
+        """Gửi GET và đọc hết thân; trả về (mã trạng thái, headers, thân)"""
+        if self.writer is None:
+            await self.connect()
+        self.writer.write(f"GET {path} HTTP/1.1\r\nHost: {self.host}\r\n\r\n".encode("latin-1"))
+        await self.writer.drain()
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("máy chủ đóng kết nối")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            parts = []
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    # Máy chủ cắt luồng giữa chừng (ví dụ hết giờ sau khi đã gửi header)
+                    await self.close()
+                    raise ConnectionError("luồng trả về bị cắt giữa chừng")
+                size = int(line.strip(), 16)
+                data = await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                parts.append(data[:-2])
+            body = b"".join(parts)
+        else:
+            body = await self.reader.readexactly(int(headers.get("content-length", 0)))
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, headers, body
+
+# Phân vị theo phương pháp nearest-rank
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+async def run_load(paths, requests, concurrency, host="127.0.0.1", port=None, unix_path=None):
+    """Gửi `requests` yêu cầu (lần lượt theo vòng các path) với `concurrency` client"""
+    latencies = []
+    errors = 0
+    received = 0
+    next_index = 0
+
+    async def client():
+        nonlocal errors, received, next_index
+        connection = HTTPClient(host, port, unix_path)
+        try:
+            while next_index < requests:
+                path = paths[next_index % len(paths)]
+                next_index += 1
+                started = time.perf_counter()
+                try:
+                    status, _, body = await connection.get(path)
+                except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+                    errors += 1
+                    await connection.close()
+                    continue
+                latencies.append(time.perf_counter() - started)
+                received += len(body)
+                if status != 200:
+                    errors += 1
+        finally:
+            await connection.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "seconds": elapsed,
+        "throughput": requests / elapsed if elapsed > 0 else 0.0,
+        "bytes": received,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p90_ms": percentile(latencies, 90) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": (latencies[-1] if latencies else 0.0) * 1000,
+    }
+
+async def run_spawned(paths, requests, concurrency, workers, timeout):
+    from server import SolverService, start_server
+
+    service = SolverService(workers, timeout)
+    server = await start_server(service, "127.0.0.1", 0)
+    try:
+        port = server.sockets[0].getsockname()[1]
+        report = await run_load(paths, requests, concurrency, port=port)
+        # Số phép tính thực sự và số yêu cầu được gộp ở phía máy chủ
+        report["server"] = dict(service.stats)
+        return report
+    finally:
+        server.close()
+        await server.wait_closed()
+        service.close()
+
+def print_report(report):
+    print(f"Yeu cau: {report['requests']} (loi: {report['errors']}), dong thoi: {report['concurrency']}")
+    print(f"Thoi gian: {report['seconds']:.2f}s, thong luong: {report['throughput']:.1f} yeu cau/s, "
+          f"du lieu nhan: {report['bytes']} byte")
+    print(f"Do tre: p50 {report['p50_ms']:.2f} ms, p90 {report['p90_ms']:.2f} ms, "
+          f"p99 {report['p99_ms']:.2f} ms, max {report['max_ms']:.2f} ms")
+    if "server" in report:
+        server = report["server"]
+        print(f"May chu: {server['computations']} lan tinh, {server['coalesced']} yeu cau duoc gop")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Đo thông lượng và độ trễ của server.py")
+    parser.add_argument("--path", action="append", default=None,
+                        help="đường dẫn yêu cầu (lặp lại được, gửi lần lượt theo vòng)")
+    parser.add_argument("--requests", type=int, default=1000, help="tổng số yêu cầu")
+    parser.add_argument("--concurrency", type=int, default=16, help="số client đồng thời")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", default=None, metavar="PATH", help="kết nối qua Unix socket")
+    parser.add_argument("--spawn", action="store_true", help="chạy máy chủ trong tiến trình này trên cổng tạm")
+    parser.add_argument("--workers", type=int, default=None, help="số tiến trình giải khi dùng --spawn")
+    parser.add_argument("--timeout", type=float, default=30.0, help="timeout mỗi yêu cầu khi dùng --spawn")
+    parser.add_argument("--json", action="store_true", help="in kết quả dạng JSON")
+    args = parser.parse_args()
+    if args.requests <= 0 or args.concurrency <= 0:
+        parser.error("--requests và --concurrency phải dương")
+
+    paths = args.path or list(DEFAULT_PATHS)
+    if args.spawn:
+        report = asyncio.run(run_spawned(paths, args.requests, args.concurrency, args.workers, args.timeout))
+    else:
+        report = asyncio.run(run_load(paths, args.requests, args.concurrency, args.host, args.port, args.unix))
+    if args.json:
+        print(json.dumps(report))
+    else:
+        print_report(report)
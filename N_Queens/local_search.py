@@ -0,0 +1,171 @@
+# Tìm MỘT lời giải cho bàn cờ rất lớn (N = 10^4 .. 10^6) bằng tìm kiếm cục bộ.
+#
+# Thuật toán min-conflicts dạng hoán vị (Sosic & Gu): cột của các quân hậu
+# luôn là một hoán vị nên không bao giờ có xung đột cột; chỉ cần đếm số quân
+# hậu trên mỗi đường chéo (row + col) và đường chéo phụ (row - col). Mỗi bước
+# sửa là hoán đổi cột của hai hàng, cập nhật bộ đếm trong O(1).
+#
+# Cách chạy:  python local_search.py N [--seed S] [--max-steps K]
+import argparse
+import random
+import time
+
+import numpy as np
+
+from constructive import construct
+from engines import iter_solutions
+from validation import is_valid_placement
+
+# Số hàng cuối cùng để lại cho giai đoạn sửa thay vì tìm chỗ không xung đột
+GREEDY_TAIL = 64
+# Số lần thử ngẫu nhiên tối đa khi tìm chỗ không xung đột cho một hàng
+GREEDY_TRIES = 64
+# Số lần thử hoán đổi liên tiếp cho một hàng trước khi chuyển sang hàng khác
+REPAIR_TRIES = 1000
+# Số bước sửa (tính theo N) trước khi bỏ cuộc và khởi động lại
+RESTART_FACTOR = 20
+
+# Đặt tham lam: duyệt từng hàng, hoán đổi với một hàng phía sau được chọn
+# ngẫu nhiên sao cho quân hậu không nằm trên đường chéo đã có quân
+def _greedy_placement(col, diag, anti, num_queens, rand):
+    offset = num_queens - 1
+    greedy_rows = max(0, num_queens - GREEDY_TAIL)
+    for row in range(num_queens):
+        if row < greedy_rows:
+            remaining = num_queens - row
+            for _ in range(GREEDY_TRIES):
+                other = row + int(rand() * remaining)
+                candidate = col[other]
+                if diag[row + candidate] == 0 and anti[row - candidate + offset] == 0:
+                    col[other] = col[row]
+                    col[row] = candidate
+                    break
+        current = col[row]
+        diag[row + current] += 1
+        anti[row - current + offset] += 1
+
+# Số quân hậu khác cùng đường chéo với quân ở (row, current)
+def _conflicts(row, current, diag, anti, offset):
+    return diag[row + current] + anti[row - current + offset] - 2
+
+# Các hàng đang bị tấn công, tính vector hóa trên toàn bàn cờ
+def _conflicted_rows(cols, diag, anti):
+    rows = np.arange(len(cols), dtype=np.int64)
+    cols = cols.astype(np.int64, copy=False)
+    offset = len(cols) - 1
+    return np.flatnonzero((diag[rows + cols] > 1) | (anti[rows - cols + offset] > 1))
+
+# Sửa dần các hàng đang xung đột bằng cách hoán đổi với một hàng ngẫu nhiên.
+# Trả về số bước đã dùng nếu hết xung đột, hoặc None nếu dùng hết `budget`.
+def _repair(cols, diag, anti, rand, budget):
+    num_queens = len(cols)
+    col, dg, an = cols.data, diag.data, anti.data
+    offset = num_queens - 1
+    steps = 0
+    conflicted = _conflicted_rows(cols, diag, anti)
+    while len(conflicted):
+        for row in conflicted.tolist():
+            # Thử hoán đổi liên tục cho tới khi hàng này hết xung đột, để tránh
+            # phải quét lại toàn bàn cờ sau mỗi bước
+            for _ in range(REPAIR_TRIES):
+                ci = col[row]
+                if _conflicts(row, ci, dg, an, offset) == 0:
+                    break
+                if steps >= budget:
+                    return None
+                steps += 1
+                other = int(rand() * num_queens)
+                if other == row:
+                    continue
+                cj = col[other]
+                # Gỡ hai quân hậu rồi so sánh số xung đột của vị trí cũ và mới
+                dg[row + ci] -= 1; an[row - ci + offset] -= 1
+                dg[other + cj] -= 1; an[other - cj + offset] -= 1
+                before = dg[row + ci] + an[row - ci + offset] + dg[other + cj] + an[other - cj + offset]
+                after = dg[row + cj] + an[row - cj + offset] + dg[other + ci] + an[other - ci + offset]
+                # Hai vị trí cùng một đường chéo thì đặt quân thứ hai sẽ thêm một xung đột
+                if row + ci == other + cj or row - ci == other - cj:
+                    before += 1
+                if row + cj == other + ci or row - cj == other - ci:
+                    after += 1
+                # Chấp nhận cả bước đi ngang (không tệ hơn) để thoát khỏi vùng bằng phẳng
+                if after <= before:
+                    col[row], col[other] = cj, ci
+                    ci, cj = cj, ci
+                dg[row + ci] += 1; an[row - ci + offset] += 1
+                dg[other + cj] += 1; an[other - cj + offset] += 1
+        conflicted = _conflicted_rows(cols, diag, anti)
+    return steps
+
+def min_conflicts(num_queens, seed=None, max_steps=None):
+    """Tìm một lời giải bằng min-conflicts.
+
+    Trả về mảng int32 cols (cols[row] = cột), hoặc None nếu vượt quá
+    max_steps lần thử hoán đổi mà vẫn còn xung đột (hoặc bài toán vô nghiệm).
+    Khi kẹt ở cực tiểu địa phương (thường gặp với N nhỏ), thuật toán khởi
+    động lại từ một hoán vị ngẫu nhiên mới.
+    """
+    # Bài toán vô nghiệm với N âm, N = 2 và N = 3
+    if num_queens < 0 or num_queens in (2, 3):
+        return None
+    if max_steps is None:
+        max_steps = 100 * num_queens + 100_000
+    rng = np.random.default_rng(seed)
+    rand = random.Random(int(rng.integers(2**63))).random
+    restart_steps = RESTART_FACTOR * num_queens + 100
+
+    while True:
+        cols = rng.permutation(num_queens).astype(np.int32)
+        diag = np.zeros(max(2 * num_queens - 1, 0), dtype=np.int32)
+        anti = np.zeros(max(2 * num_queens - 1, 0), dtype=np.int32)
+        # memoryview ghi thẳng vào mảng NumPy nhưng đọc/ghi từng phần tử nhanh hơn nhiều
+        _greedy_placement(cols.data, diag.data, anti.data, num_queens, rand)
+
+        budget = min(max_steps, restart_steps)
+        steps = _repair(cols, diag, anti, rand, budget)
+        if steps is not None:
+            return cols
+        max_steps -= budget
+        if max_steps <= 0:
+            return None
+
+# Tìm lời giải đầu tiên theo thứ tự của solve() bằng quay lui
+def first_backtracking(num_queens, seed=None, max_steps=None):
+    solution = next(iter_solutions(num_queens), None)
+    return None if solution is None else np.array(solution, dtype=np.int32)
+
+# Dựng lời giải bằng công thức (xem constructive.py); seed và max_steps không dùng
+def first_constructive(num_queens, seed=None, max_steps=None):
+    return construct(num_queens)
+
+# Các phương pháp tìm một lời giải
+METHODS = {
+    "min-conflicts": min_conflicts,
+    "backtracking": first_backtracking,
+    "constructive": first_constructive,
+}
+
+def find_one(num_queens, method="min-conflicts", seed=None, max_steps=None):
+    """Tìm một lời giải bất kỳ; trả về mảng int32 cols hoặc None."""
+    try:
+        finder = METHODS[method]
+    except KeyError:
+        raise ValueError(f"Phương pháp không hợp lệ: {method!r} (chọn một trong {sorted(METHODS)})") from None
+    return finder(num_queens, seed=seed, max_steps=max_steps)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tìm một lời giải N quân hậu cho N rất lớn")
+    parser.add_argument("num_queens", type=int, help="số quân hậu")
+    parser.add_argument("--method", choices=sorted(METHODS), default="min-conflicts")
+    parser.add_argument("--seed", type=int, default=None, help="hạt giống ngẫu nhiên")
+    parser.add_argument("--max-steps", type=int, default=None, help="số bước sửa tối đa")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    cols = find_one(args.num_queens, args.method, args.seed, args.max_steps)
+    elapsed = time.perf_counter() - start
+    if cols is None:
+        print(f"Không tìm được lời giải cho {args.num_queens}-Queens ({elapsed:.2f}s)")
+    else:
+        print(f"Tìm được lời giải cho {args.num_queens}-Queens trong {elapsed:.2f}s, "
+              f"hợp lệ: {is_valid_placement(cols)}")
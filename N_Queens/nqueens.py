@@ -0,0 +1,168 @@
+# Giao diện dòng lệnh không tương tác cho các chức năng chính, dùng được trong
+# script và batch job (không gọi input()).
+#
+# Cách chạy:
+#   python nqueens.py count --n 12 [--fix R,C ...] [--block R,C ...] [--no-cache] [--format text|json]
+#   python nqueens.py solve --n 8 [--engine bitmask] [--limit K] [--fix R,C ...] [--block R,C ...]
+#                           [--format text|json|ndjson]
+#   python nqueens.py first --n 100000 [--method min-conflicts] [--seed S] [--format text|json]
+#   python nqueens.py export --n 8 [--fast] [--workers W] [--video out.gif] [--full-trace]
+#
+# Mỗi lệnh chỉ import các module nó cần ngay trong hàm xử lý: `count` không nạp
+# NumPy hay matplotlib nên khởi động đủ nhanh để gọi hàng nghìn lần; NumPy chỉ
+# được nạp khi in bàn cờ hoặc tìm một lời giải, matplotlib chỉ khi export.
+import argparse
+import json
+import os
+import sys
+
+from engines import DEFAULT_ENGINE, ENGINES
+
+# Giống local_search.METHODS; không import local_search ở đây vì nó nạp NumPy
+METHODS = ("min-conflicts", "backtracking", "constructive")
+
+# Đọc ô "R,C" (giống constrained.parse_cell, định nghĩa lại để không phải nạp
+# constrained.py khi chỉ tra bảng)
+def parse_cell(text):
+    row, col = text.split(",")
+    return int(row), int(col)
+
+def command_count(args):
+    if args.block:
+        from constrained import count_completions
+        total = count_completions(args.n, args.fix, set(args.block))
+    elif args.no_cache:
+        if args.fix:
+            from constrained import count_completions
+            total = count_completions(args.n, args.fix)
+        else:
+            from engines import count
+            total = count(args.n)
+    else:
+        from cache import cached_count
+        total = cached_count(args.n, args.fix)
+    if args.format == "json":
+        print(json.dumps({"n": args.n, "count": total}))
+    else:
+        print(f"=> Tong so loi giai tim duoc: {total}")
+
+# Nguồn lời giải giống 8queens.py: hoàn thành bàn cờ khi có quân cố định/ô cấm
+# (main() từ chối --engine khác mặc định trong trường hợp này), sinh dần bằng iter_solutions với engine mặc định, còn lại gọi solve()
+def _solutions(args):
+    if args.fix or args.block:
+        from constrained import complete
+        return complete(args.n, args.fix, set(args.block), limit=args.limit)
+    if args.engine == DEFAULT_ENGINE:
+        from engines import iter_solutions
+        return iter_solutions(args.n, limit=args.limit)
+    from engines import solve
+    return iter(solve(args.n, engine=args.engine)[:args.limit])
+
+def command_solve(args):
+    solutions = _solutions(args)
+    out = sys.stdout
+    index = 0
+    if args.format == "ndjson":
+        for index, solution in enumerate(solutions, 1):
+            out.write(json.dumps(solution) + "\n")
+    elif args.format == "json":
+        out.write(f'{{"n": {args.n}, "solutions": [')
+        for index, solution in enumerate(solutions, 1):
+            out.write(("" if index == 1 else ", ") + json.dumps(solution))
+        out.write(f'], "count": {index}}}\n')
+    else:
+        from itertools import islice
+
+        import numpy as np
+
+        from rendering import format_solutions
+        while True:
+            batch = list(islice(solutions, 4096))
+            if not batch:
+                break
+            out.write(format_solutions(np.array(batch, dtype=np.intp), start=index + 1))
+            index += len(batch)
+        print(f"\n=> Tong so loi giai tim duoc: {index}")
+
+def command_first(args):
+    from local_search import find_one
+    cols = find_one(args.n, method=args.method, seed=args.seed)
+    if args.format == "json":
+        print(json.dumps({"n": args.n, "method": args.method,
+                          "solution": None if cols is None else cols.tolist()}))
+    elif cols is None:
+        print(f"Không tìm được lời giải cho {args.n} quân hậu.")
+    elif args.n <= 64:
+        print(f"=> Loi giai: {cols.tolist()}")
+    else:
+        from validation import is_valid_placement
+        print(f"=> Tim duoc loi giai cho {args.n} quan hau, hop le: {is_valid_placement(cols)}")
+
+def command_export(args):
+    # Export không cần màn hình
+    os.environ.setdefault("MPLBACKEND", "Agg")
+    from minh_hoa import export_solution_steps
+    if not export_solution_steps(args.n, fast=args.fast, workers=args.workers or None, video=args.video,
+                                 fps=args.fps, full_trace=args.full_trace):
+        return 1
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="nqueens", description="Giải bài toán N quân hậu (không tương tác)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_board_options(sub):
+        sub.add_argument("--n", type=int, required=True, help="số quân hậu")
+        sub.add_argument("--fix", type=parse_cell, action="append", default=[], metavar="R,C",
+                         help="quân hậu cố định tại hàng R, cột C (lặp lại được)")
+        sub.add_argument("--block", type=parse_cell, action="append", default=[], metavar="R,C",
+                         help="ô cấm tại hàng R, cột C (lặp lại được)")
+
+    count_parser = commands.add_parser("count", help="đếm số lời giải")
+    add_board_options(count_parser)
+    count_parser.add_argument("--no-cache", action="store_true", help="luôn tính lại, không tra bảng/cache")
+    count_parser.add_argument("--format", choices=("text", "json"), default="text")
+    count_parser.set_defaults(handler=command_count)
+
+    solve_parser = commands.add_parser("solve", help="liệt kê các lời giải")
+    add_board_options(solve_parser)
+    solve_parser.add_argument("--engine", choices=sorted(ENGINES), default=DEFAULT_ENGINE)
+    solve_parser.add_argument("--limit", type=int, default=None, help="số lời giải tối đa")
+    solve_parser.add_argument("--format", choices=("text", "json", "ndjson"), default="text")
+    solve_parser.set_defaults(handler=command_solve)
+
+    first_parser = commands.add_parser("first", help="tìm một lời giải (dùng được cho N rất lớn)")
+    first_parser.add_argument("--n", type=int, required=True, help="số quân hậu")
+    first_parser.add_argument("--method", choices=METHODS, default="min-conflicts")
+    first_parser.add_argument("--seed", type=int, default=None)
+    first_parser.add_argument("--format", choices=("text", "json"), default="text")
+    first_parser.set_defaults(handler=command_first)
+
+    export_parser = commands.add_parser("export", help="export các bước tìm lời giải thành ảnh/video")
+    export_parser.add_argument("--n", type=int, required=True, help="số quân hậu")
+    export_parser.add_argument("--fast", action="store_true", help="dùng chế độ vẽ nhanh")
+    export_parser.add_argument("--workers", type=int, default=1, help="số tiến trình vẽ (0 = số CPU)")
+    export_parser.add_argument("--video", default=None, help="ghi thành file .mp4/.gif thay vì PNG")
+    export_parser.add_argument("--fps", type=int, default=2)
+    export_parser.add_argument("--full-trace", action="store_true",
+                               help="export cả các nhánh thử thất bại và bước quay lui")
+    export_parser.set_defaults(handler=command_export)
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.n < 0:
+        parser.error("số quân hậu phải không âm")
+    # Giống 8queens.py: quân cố định/ô cấm luôn giải bằng constrained.py
+    constrained = getattr(args, "fix", None) or getattr(args, "block", None)
+    if constrained and getattr(args, "engine", DEFAULT_ENGINE) != DEFAULT_ENGINE:
+        parser.error("--engine không dùng được cùng --fix/--block")
+    try:
+        return args.handler(args) or 0
+    except (ValueError, RuntimeError) as e:
+        print(f"Lỗi: {e}", file=sys.stderr)
+        return 2
+
+if __name__ == "__main__":
+    sys.exit(main())
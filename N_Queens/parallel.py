@@ -0,0 +1,121 @@
+# Tìm kiếm song song nhiều tiến trình cho bài toán N quân hậu.
+#
+# Không gian tìm kiếm được chia theo các tiền tố hợp lệ của k hàng đầu
+# (k = 1..3). Mỗi tiền tố là một đơn vị công việc độc lập, được gửi tới
+# ProcessPoolExecutor; kết quả được ghép lại theo thứ tự tiền tố nên khớp
+# hoàn toàn với thứ tự của solve() chạy tuần tự.
+#
+# Cách chạy:  python parallel.py N [--depth K] [--workers W] [--scaling]
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from engines import count_from, prefix_masks, search_bitmask
+
+# Liệt kê mọi tiền tố hợp lệ gồm `depth` hàng đầu, theo thứ tự từ điển
+def enumerate_prefixes(num_queens, depth):
+    depth = max(0, min(depth, num_queens))
+    prefixes = []
+    full = (1 << num_queens) - 1
+
+    def extend(state, cols, diag1, diag2):
+        if len(state) == depth:
+            prefixes.append(tuple(state))
+            return
+        available = full & ~(cols | diag1 | diag2)
+        while available:
+            bit = available & -available
+            available ^= bit
+            state.append(bit.bit_length() - 1)
+            extend(state, cols | bit, ((diag1 | bit) << 1) & full, (diag2 | bit) >> 1)
+            state.pop()
+
+    extend([], 0, 0, 0)
+    return prefixes
+
+# Đếm số lời giải bắt đầu bằng một tiền tố (chạy trong tiến trình con)
+def count_prefix(num_queens, prefix):
+    full = (1 << num_queens) - 1
+    return count_from(*prefix_masks(prefix, num_queens), full)
+
+# Liệt kê các lời giải bắt đầu bằng một tiền tố (chạy trong tiến trình con)
+def solve_prefix(num_queens, prefix):
+    solutions = []
+    search_bitmask(list(prefix), solutions, num_queens)
+    return solutions
+
+# Số tiến trình mặc định: toàn bộ số lõi CPU
+def default_workers():
+    return os.cpu_count() or 1
+
+# Chạy `task` trên mọi tiền tố; map() giữ nguyên thứ tự đầu vào nên kết quả
+# luôn theo thứ tự từ điển bất kể tiến trình nào xong trước
+def _map_prefixes(task, num_queens, prefixes, workers):
+    workers = workers or default_workers()
+    if workers == 1:
+        return [task(num_queens, prefix) for prefix in prefixes]
+    # Gom nhiều tiền tố vào một lần gửi để giảm chi phí giao tiếp giữa tiến trình
+    chunksize = max(1, len(prefixes) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(task, [num_queens] * len(prefixes), prefixes, chunksize=chunksize))
+
+# Đếm song song số lời giải. Giống count(), chỉ các tiền tố có quân hậu
+# hàng 0 ở nửa trái (và cột giữa với n lẻ) được duyệt; nửa trái được nhân đôi.
+def parallel_count(num_queens, depth=2, workers=None):
+    if num_queens <= 0:
+        return 1 if num_queens == 0 else 0
+    half = num_queens // 2
+    prefixes = [prefix for prefix in enumerate_prefixes(num_queens, max(depth, 1))
+                if prefix[0] < half or (num_queens % 2 == 1 and prefix[0] == half)]
+    counts = _map_prefixes(count_prefix, num_queens, prefixes, workers)
+    return sum(total * (2 if prefix[0] < half else 1) for prefix, total in zip(prefixes, counts))
+
+# Liệt kê song song mọi lời giải, cùng thứ tự với solve()
+def parallel_solve(num_queens, depth=2, workers=None):
+    if num_queens < 0:
+        return []
+    solutions = []
+    prefixes = enumerate_prefixes(num_queens, depth)
+    for chunk in _map_prefixes(solve_prefix, num_queens, prefixes, workers):
+        solutions.extend(chunk)
+    return solutions
+
+# Đo thời gian đếm với 1, 2, 4, 8... tiến trình cho tới số lõi tối đa
+def scaling_report(num_queens, depth=2, max_workers=None):
+    max_workers = max_workers or default_workers()
+    workers = 1
+    base = None
+    print(f"{'workers':>8} {'loi giai':>12} {'thoi gian (s)':>14} {'tang toc':>9}")
+    while True:
+        start = time.perf_counter()
+        total = parallel_count(num_queens, depth, workers)
+        elapsed = time.perf_counter() - start
+        base = base or elapsed
+        print(f"{workers:>8} {total:>12} {elapsed:>14.3f} {base / elapsed:>8.2f}x")
+        if workers >= max_workers:
+            break
+        workers = min(workers * 2, max_workers)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Giải song song bài toán N quân hậu")
+    parser.add_argument("num_queens", type=int, help="số quân hậu")
+    parser.add_argument("--depth", type=int, default=2, choices=(1, 2, 3),
+                        help="số hàng đầu dùng để chia công việc")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="số tiến trình (mặc định: số lõi CPU)")
+    parser.add_argument("--solve", action="store_true",
+                        help="liệt kê lời giải thay vì chỉ đếm")
+    parser.add_argument("--scaling", action="store_true",
+                        help="đo tốc độ với 1, 2, 4, 8... tiến trình")
+    args = parser.parse_args()
+
+    if args.scaling:
+        scaling_report(args.num_queens, args.depth, args.workers)
+    elif args.solve:
+        solutions = parallel_solve(args.num_queens, args.depth, args.workers)
+        print(f"=> Tong so loi giai tim duoc: {len(solutions)}")
+        for index, solution in enumerate(solutions, start=1):
+            print(f"Loi giai {index}: {solution}")
+    else:
+        print(f"=> Tong so loi giai tim duoc: {parallel_count(args.num_queens, args.depth, args.workers)}")
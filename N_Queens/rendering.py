@@ -0,0 +1,131 @@
+# Chuyển một lô lời giải (S, N) thành bàn cờ dạng chữ hoặc tensor uint8.
+#
+# Mọi ô được đặt bằng fancy indexing trên cả lô nên không có vòng lặp Python
+# theo từng ô; chỉ còn một thao tác nhỏ cho mỗi lời giải khi ghép chuỗi.
+# attack_mask/AttackMap tính các ô bị tấn công cho minh_hoa.py theo cùng cách.
+from functools import lru_cache
+
+import numpy as np
+
+EMPTY = ord("-")
+QUEEN = ord("Q")
+
+# Tensor (S, N, N) kiểu uint8: 1 ở ô có quân hậu, 0 ở ô trống
+def board_tensor(solutions):
+    solutions = np.asarray(solutions, dtype=np.intp)
+    num_solutions, n = solutions.shape
+    boards = np.zeros((num_solutions, n, n), dtype=np.uint8)
+    boards[np.arange(num_solutions)[:, None], np.arange(n), solutions] = 1
+    return boards
+
+# Bảng ký tự (S, N, 2N): mỗi hàng là "c c c ... c\n" với c là '-' hoặc 'Q',
+# giống định dạng " ".join(row) của 8queens.py
+def _text_grid(solutions):
+    solutions = np.asarray(solutions, dtype=np.intp)
+    num_solutions, n = solutions.shape
+    template = np.full((n, 2 * n), EMPTY, dtype=np.uint8)
+    template[:, 1::2] = ord(" ")
+    template[:, -1] = ord("\n")
+    grid = np.repeat(template[None], num_solutions, axis=0)
+    grid[np.arange(num_solutions)[:, None], np.arange(n), 2 * solutions] = QUEEN
+    return grid
+
+# Danh sách chuỗi bàn cờ (mỗi chuỗi kết thúc bằng '\n')
+def render_text(solutions):
+    grid = _text_grid(solutions)
+    if grid.size == 0:
+        return [""] * len(grid)
+    data = grid.tobytes().decode("ascii")
+    size = grid.shape[1] * grid.shape[2]
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+# Bảng chuỗi "(hàng, cột)" cho mọi ô, dựng một lần cho mỗi N (được cache nên
+# để chỉ đọc, các lần gọi sau dùng chung một mảng)
+@lru_cache(maxsize=16)
+def _coordinate_table(n):
+    table = np.empty((n, n), dtype=object)
+    for row in range(n):
+        table[row] = [f"({row}, {col})" for col in range(n)]
+    table.flags.writeable = False
+    return table
+
+# Ghép toàn bộ phần in của một lô lời giải (tiêu đề, bàn cờ, tọa độ) thành một
+# chuỗi, đánh số từ `start`; cùng định dạng với __main__ của 8queens.py
+def format_solutions(solutions, start=1):
+    solutions = np.asarray(solutions, dtype=np.intp)
+    if len(solutions) == 0:
+        return ""
+    n = solutions.shape[1]
+    table = _coordinate_table(n)
+    rows = np.arange(n)
+    parts = []
+    for index, (solution, board) in enumerate(zip(solutions, render_text(solutions)), start=start):
+        parts.append(f"\n--- Loi giai {index}: {solution.tolist()} ---\n")
+        parts.append(board)
+        parts.append("Toa do cac quan hau (hàng, cột): ")
+        parts.append(", ".join(table[rows, solution]))
+        parts.append("\n")
+    return "".join(parts)
+
+# Mặt nạ (N, N) kiểu bool các ô bị tấn công bởi các quân hậu state[row] = cột
+# (không tính ô có quân hậu). Ô (i, j) bị tấn công khi i == r, j == c,
+# i - j == r - c hoặc i + j == r + c với một quân hậu (r, c) nào đó; phép so
+# sánh được broadcast trên (quân hậu, i, j) rồi OR theo trục quân hậu.
+def attack_mask(state, num_queens):
+    queens = np.asarray(state, dtype=np.intp)
+    i = np.arange(num_queens)[:, None]
+    j = np.arange(num_queens)[None, :]
+    r = np.arange(len(queens))[:, None, None]
+    c = queens[:, None, None]
+    attacked = ((i == r) | (j == c) | (i - j == r - c) | (i + j == r + c)).any(axis=0)
+    attacked[np.arange(len(queens)), queens] = False
+    return attacked
+
+class AttackMap:
+    """Số quân hậu tấn công mỗi ô, cập nhật dần khi đặt (push) hoặc gỡ (pop) một quân.
+
+    Mỗi lần push/pop chỉ cộng/trừ mặt nạ bốn đường (hàng, cột, hai đường chéo)
+    của một quân hậu nên không phải tính lại từ đầu cho cả bàn cờ.
+    """
+
+    def __init__(self, num_queens):
+        self.num_queens = num_queens
+        i = np.arange(num_queens)[:, None]
+        j = np.arange(num_queens)[None, :]
+        self.rows = np.broadcast_to(i, (num_queens, num_queens))
+        self.cols = np.broadcast_to(j, (num_queens, num_queens))
+        self.diagonals = i - j
+        self.antidiagonals = i + j
+        self.counts = np.zeros((num_queens, num_queens), dtype=np.int32)
+        self.queens = []
+
+    def lines(self, row, col):
+        return ((self.rows == row) | (self.cols == col)
+                | (self.diagonals == row - col) | (self.antidiagonals == row + col))
+
+    def push(self, col):
+        row = len(self.queens)
+        self.counts += self.lines(row, col)
+        self.queens.append(col)
+
+    def pop(self):
+        col = self.queens.pop()
+        self.counts -= self.lines(len(self.queens), col)
+        return col
+
+    # Đưa về trạng thái `state`: chỉ gỡ/đặt lại phần khác với trạng thái hiện tại
+    def sync(self, state):
+        common = 0
+        for current, wanted in zip(self.queens, state):
+            if current != wanted:
+                break
+            common += 1
+        while len(self.queens) > common:
+            self.pop()
+        for col in state[common:]:
+            self.push(col)
+
+    def mask(self):
+        attacked = self.counts > 0
+        attacked[np.arange(len(self.queens)), self.queens] = False
+        return attacked
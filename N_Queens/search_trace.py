@@ -0,0 +1,118 @@
+# Ghi lại quá trình tìm kiếm của minh_hoa.py dưới dạng nhật ký sự kiện gọn.
+#
+# Mỗi sự kiện là một số nguyên trong array('i') chỉ ghi thêm:
+#   c >= 0   : thử đặt quân hậu ở cột c cho hàng kế tiếp ("trying")
+#   POP (-1) : gỡ quân hậu cuối cùng (quay lui, "backtrack")
+#   SOLUTION : đã đặt đủ quân hậu ("solution")
+# Việc ghi tốn O(1) cho mỗi bước (4 byte mỗi sự kiện); các trạng thái (state)
+# chỉ được dựng lại khi cần vẽ hoặc phát lại, nên vết tìm kiếm hàng nghìn bước
+# với N = 10..12 vẫn nằm gọn trong bộ nhớ.
+from array import array
+
+from engines import get_candidates, is_valid_state
+
+POP = -1
+SOLUTION = -2
+
+class SearchTrace:
+    """Nhật ký sự kiện của một lần tìm kiếm; len() và slicing tính theo các bước hiển thị."""
+
+    def __init__(self, num_queens, initial_state=()):
+        self.num_queens = num_queens
+        self.initial_state = list(initial_state)
+        self.events = array("i")
+        self.num_steps = 0
+        self.solution = None
+
+    def push(self, col):
+        self.events.append(col)
+        self.num_steps += 1
+
+    # depth: số quân hậu còn lại sau khi gỡ; quay lui về trạng thái rỗng không
+    # được tính là một bước hiển thị (giống search_for_final_solution cũ)
+    def pop(self, depth):
+        self.events.append(POP)
+        if depth > 0:
+            self.num_steps += 1
+
+    def found(self, state):
+        self.events.append(SOLUTION)
+        self.num_steps += 1
+        self.solution = list(state)
+
+    def __len__(self):
+        return self.num_steps
+
+    @property
+    def nbytes(self):
+        return self.events.itemsize * len(self.events)
+
+    def steps(self, start=0, stop=None):
+        """Phát lại các bước (step_type, state[, candidate]) có chỉ số trong [start, stop)"""
+        stop = self.num_steps if stop is None else min(stop, self.num_steps)
+        state = list(self.initial_state)
+        index = 0
+        for event in self.events:
+            if index >= stop:
+                return
+            if event >= 0:
+                if index >= start:
+                    yield ("trying", state.copy(), event)
+                index += 1
+                state.append(event)
+            elif event == POP:
+                state.pop()
+                if state:
+                    if index >= start:
+                        yield ("backtrack", state.copy())
+                    index += 1
+            else:
+                if index >= start:
+                    yield ("solution", state.copy())
+                index += 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.num_steps)
+            steps = list(self.steps(start, stop))
+            return steps[::step] if step != 1 else steps
+        if index < 0:
+            index += self.num_steps
+        if not 0 <= index < self.num_steps:
+            raise IndexError("chỉ số bước nằm ngoài vết tìm kiếm")
+        return next(self.steps(index, index + 1))
+
+    def __iter__(self):
+        return self.steps()
+
+    def solution_path(self):
+        """Đường đi thẳng tới lời giải (các bước thử trên nhánh thành công và lời giải),
+        đúng định dạng search_for_final_solution trả về; None nếu không có lời giải"""
+        if self.solution is None:
+            return None
+        solution = self.solution
+        base = len(self.initial_state)
+        path = [("trying", solution[:row], solution[row]) for row in range(base, len(solution))]
+        path.append(("solution", solution.copy()))
+        return path
+
+def record_search(num_queens, state=()):
+    """Tìm lời giải đầu tiên (cùng thứ tự thử với minh_hoa.py) và ghi lại mọi bước"""
+    trace = SearchTrace(num_queens, state)
+    state = list(state)
+
+    def search():
+        if is_valid_state(state, num_queens):
+            trace.found(state)
+            return True
+        for candidate in get_candidates(state, num_queens):
+            trace.push(candidate)
+            state.append(candidate)
+            if search():
+                return True
+            state.pop()
+            trace.pop(len(state))
+        return False
+
+    search()
+    return trace
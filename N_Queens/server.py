@@ -0,0 +1,469 @@
+# Dịch vụ giải N quân hậu chạy cục bộ (HTTP trên TCP hoặc Unix socket) bằng asyncio.
+#
+# Các service khác gọi qua HTTP thay vì tự khởi động một tiến trình Python mới
+# cho mỗi lần solve(). Máy chủ giữ sẵn một ProcessPoolExecutor đã được làm nóng
+# và gộp các yêu cầu giống nhau đang chạy đồng thời (cùng N / ràng buộc) thành
+# một lần tính duy nhất.
+#
+# Các endpoint (GET):
+#   /count?n=12[&fix=R,C ...][&block=R,C ...][&long=1] -> {"n": 12, "count": 14200}
+#       N ngoài bảng số lời giải đã biết bị từ chối trừ khi có long=1
+#   /solve?n=12[&limit=K][&fix=R,C][&block=R,C][&format=ndjson|binary]
+#       trả về dạng chunked: mỗi dòng NDJSON là một lời giải, hoặc mỗi lời giải là
+#       N số uint16 little-endian (format=binary, header X-Queens-N)
+#   /first?n=100000[&method=min-conflicts][&seed=S]     -> {"n": ..., "solution": [...]}
+#   /stats, /health
+# Mọi endpoint nhận thêm timeout=giây (tối đa MAX_TIMEOUT).
+#
+# Lời giải của /solve được tính theo từng tiền tố hàng đầu (như parallel.py),
+# hoặc theo các nhánh MRV đầu tiên (constrained.split_fixed) khi có fix/block,
+# và gửi đi theo thứ tự ngay khi đơn vị tương ứng xong; chỉ một số đơn vị được
+# tính trước, và mỗi khối đều chờ writer.drain() nên client đọc chậm sẽ làm
+# máy chủ chậm lại thay vì dồn dữ liệu vào bộ nhớ.
+#
+# ProcessPoolExecutor không dừng được việc đang chạy, nên khi một phép tính
+# không còn client nào chờ (hết giờ, ngắt kết nối) mà vẫn chạy quá
+# ABANDON_GRACE giây, pool bị dựng lại và các tiến trình cũ bị dừng hẳn; các
+# phép tính khác đang chạy trên pool cũ được tính lại trên pool mới.
+#
+# Cách chạy:  python server.py [--host 127.0.0.1] [--port 8765] [--unix PATH] [--workers W]
+#             (đo tải bằng loadgen.py)
+import argparse
+import asyncio
+import json
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import parse_qs, urlsplit
+
+from cache import KNOWN_COUNTS
+from constrained import split_fixed
+from parallel import default_workers, enumerate_prefixes, solve_prefix
+
+DEFAULT_PORT = 8765
+DEFAULT_TIMEOUT = 30.0
+MAX_TIMEOUT = 300.0
+# Số lời giải trong một khối gửi đi khi stream
+STREAM_BATCH = 512
+# Giới hạn bộ đệm ghi của mỗi kết nối (byte) trước khi drain() phải chờ
+WRITE_BUFFER_HIGH = 256 * 1024
+MAX_HEADER_LINES = 100
+# Thời gian (giây) một phép tính không còn ai chờ được phép chạy tiếp trước khi
+# pool bị dựng lại
+ABANDON_GRACE = 1.0
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           500: "Internal Server Error", 504: "Gateway Timeout"}
+
+# Các hàm chạy trong tiến trình con (phải ở cấp module để pickle được)
+def _warm_up():
+    import cache  # noqa: F401 - nạp sẵn các module tìm kiếm trong tiến trình con
+    return True
+
+def _count_task(num_queens, fixed, blocked):
+    if blocked:
+        from constrained import count_completions
+        return count_completions(num_queens, fixed, set(blocked))
+    from cache import cached_count
+    return cached_count(num_queens, fixed)
+
+# Lời giải của một đơn vị từ split_fixed (các quân cố định đã mở rộng)
+def _complete_task(num_queens, fixed, blocked, limit):
+    from constrained import complete
+    return list(complete(num_queens, fixed, set(blocked), limit=limit))
+
+def _first_task(num_queens, method, seed):
+    from local_search import find_one
+    cols = find_one(num_queens, method=method, seed=seed)
+    return None if cols is None else cols.tolist()
+
+class RequestError(ValueError):
+    """Yêu cầu không hợp lệ (trả về 400/404/405)"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+def _parse_cells(values):
+    cells = []
+    for text in values:
+        try:
+            row, col = text.split(",")
+            cells.append((int(row), int(col)))
+        except ValueError:
+            raise RequestError(f"Ô không hợp lệ: {text!r} (dạng R,C)") from None
+    return tuple(sorted(set(cells)))
+
+def _int_param(query, name, default=None, required=False):
+    values = query.get(name)
+    if not values:
+        if required:
+            raise RequestError(f"Thiếu tham số {name}")
+        return default
+    try:
+        return int(values[-1])
+    except ValueError:
+        raise RequestError(f"Tham số {name} phải là số nguyên") from None
+
+def _bool_param(query, name):
+    return query.get(name, ["0"])[-1].lower() in ("1", "true", "yes")
+
+def _solve_depth(num_queens):
+    # Tiền tố 1 hàng đủ nhỏ với N nhỏ; N lớn chia 2 hàng để khối đầu tiên đến sớm
+    return 1 if num_queens < 12 else 2
+
+# Một khối lời giải: các dòng JSON, hoặc N số uint16 little-endian mỗi lời giải
+def _encode(solutions, output_format):
+    if output_format == "ndjson":
+        return "".join(json.dumps(solution) + "\n" for solution in solutions).encode()
+    values = array("H", (col for solution in solutions for col in solution))
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tobytes()
+
+class _StreamAborted(Exception):
+    """Luồng trả về bị dừng giữa chừng; kết nối phải đóng"""
+
+# Dừng hẳn một pool: shutdown() không dừng được việc đang chạy nên các tiến
+# trình con bị terminate; việc còn chờ trên pool nhận BrokenProcessPool
+# (hoặc bị hủy nếu cancel_futures).
+# ProcessPoolExecutor không có API công khai để lấy tiến trình con; CPython
+# (3.8-3.13) giữ chúng trong thuộc tính riêng _processes (dict pid -> Process,
+# thành None sau shutdown). Nếu thuộc tính đó không có thì chỉ shutdown.
+def _terminate(executor, cancel_futures=False):
+    processes = list((getattr(executor, "_processes", None) or {}).values())
+    executor.shutdown(wait=False, cancel_futures=cancel_futures)
+    for process in processes:
+        process.terminate()
+
+class _Computation:
+    """Một phép tính trong pool và số client đang chờ nó"""
+
+    def __init__(self, job, generation):
+        self.job = job
+        self.future = asyncio.wrap_future(job)
+        self.generation = generation
+        self.waiters = 0
+
+class SolverService:
+    """Máy chủ HTTP tối giản quanh các hàm giải, dùng chung một process pool."""
+
+    def __init__(self, workers=None, timeout=DEFAULT_TIMEOUT):
+        self.workers = workers or default_workers()
+        self.timeout = timeout
+        self.executor = None
+        # Tăng mỗi lần pool được dựng lại
+        self.generation = 0
+        # Các phép tính đang chạy: khóa -> _Computation; yêu cầu trùng khóa dùng lại nó
+        self.inflight = {}
+        self.stats = {"requests": 0, "computations": 0, "coalesced": 0, "timeouts": 0, "errors": 0,
+                      "recycled": 0}
+
+    async def start(self):
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        loop = asyncio.get_running_loop()
+        # Làm nóng: khởi động mọi tiến trình con và import sẵn các module
+        await asyncio.gather(*(loop.run_in_executor(self.executor, _warm_up) for _ in range(self.workers)))
+
+    def close(self):
+        if self.executor is not None:
+            _terminate(self.executor, cancel_futures=True)
+            self.executor = None
+        self.inflight.clear()
+
+    # Dựng pool mới và dừng pool cũ; client còn chờ phép tính của pool cũ sẽ
+    # nhận BrokenProcessPool và tính lại trên pool mới (xem compute)
+    def recycle(self):
+        old = self.executor
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        self.generation += 1
+        self.stats["recycled"] += 1
+        self.inflight.clear()
+        _terminate(old)
+        for _ in range(self.workers):
+            self.executor.submit(_warm_up)
+
+    async def compute(self, key, func, *args):
+        """Chạy func(*args) trong process pool, gộp các lời gọi trùng khóa đang chạy"""
+        while True:
+            entry = self.inflight.get(key)
+            if entry is None:
+                entry = _Computation(self.executor.submit(func, *args), self.generation)
+                self.inflight[key] = entry
+                self.stats["computations"] += 1
+                entry.future.add_done_callback(lambda _, entry=entry: self._finished(key, entry))
+            else:
+                self.stats["coalesced"] += 1
+            entry.waiters += 1
+            try:
+                # shield: một client hết giờ hoặc ngắt kết nối không hủy phép tính của client khác
+                return await asyncio.shield(entry.future)
+            except BrokenProcessPool:
+                if entry.generation == self.generation:
+                    # Một tiến trình con chết bất thường: dựng lại pool rồi báo lỗi
+                    self.recycle()
+                    raise
+                # Pool đã được dựng lại trong lúc chờ: tính lại trên pool mới
+            finally:
+                entry.waiters -= 1
+                if entry.waiters == 0 and not entry.future.done():
+                    self._abandon(entry)
+
+    def _finished(self, key, entry):
+        if self.inflight.get(key) is entry:
+            del self.inflight[key]
+        # Phép tính bị bỏ (không ai chờ) vẫn có thể kết thúc bằng lỗi, ví dụ
+        # BrokenProcessPool khi pool được dựng lại: đánh dấu là đã đọc lỗi
+        if not entry.future.cancelled():
+            entry.future.exception()
+
+    # Không còn client nào chờ: cho phép tính ABANDON_GRACE giây để xong (yêu cầu
+    # mới cùng khóa vẫn dùng lại được nó) trước khi dựng lại pool. Không gọi
+    # job.cancel(): việc đã hủy còn nằm trong hàng đợi của pool làm tiến trình
+    # quản lý của ProcessPoolExecutor lỗi khi pool bị dừng.
+    def _abandon(self, entry):
+        asyncio.get_running_loop().call_later(ABANDON_GRACE, self._reap, entry)
+
+    def _reap(self, entry):
+        if (self.executor is not None and entry.waiters == 0 and not entry.job.done()
+                and entry.generation == self.generation):
+            self.recycle()
+
+    # ----- HTTP -----
+
+    async def handle_connection(self, reader, writer):
+        writer.transport.set_write_buffer_limits(high=WRITE_BUFFER_HIGH)
+        try:
+            while True:
+                try:
+                    request = await self.read_request(reader)
+                except ValueError as e:
+                    # Dòng quá dài (vượt giới hạn của StreamReader) hoặc header hỏng:
+                    # không đọc tiếp được yêu cầu nên trả 400 rồi đóng kết nối
+                    self.stats["errors"] += 1
+                    await self.send_json(writer, 400, {"error": str(e) or "yêu cầu không hợp lệ"}, False)
+                    break
+                if request is None:
+                    break
+                method, target, headers = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                self.stats["requests"] += 1
+                try:
+                    await self.dispatch(method, target, writer, keep_alive)
+                except RequestError as e:
+                    self.stats["errors"] += 1
+                    await self.send_json(writer, e.status, {"error": str(e)}, keep_alive)
+                except asyncio.TimeoutError:
+                    self.stats["timeouts"] += 1
+                    await self.send_json(writer, 504, {"error": "timeout"}, keep_alive)
+                except BrokenProcessPool:
+                    self.stats["errors"] += 1
+                    await self.send_json(writer, 500, {"error": "tiến trình giải dừng bất thường"}, keep_alive)
+                except ValueError as e:
+                    # Lỗi đầu vào từ các hàm giải (ví dụ quân hậu nằm ngoài bàn cờ)
+                    self.stats["errors"] += 1
+                    await self.send_json(writer, 400, {"error": str(e)}, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, _StreamAborted):
+            pass
+        except asyncio.CancelledError:
+            # Máy chủ đang tắt khi kết nối keep-alive còn mở
+            pass
+        finally:
+            writer.close()
+
+    async def read_request(self, reader):
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, _ = line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise RequestError("dòng yêu cầu không hợp lệ") from None
+        headers = {}
+        for _ in range(MAX_HEADER_LINES):
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        # Bỏ qua thân yêu cầu nếu có (mọi endpoint đều là GET)
+        try:
+            length = int(headers.get("content-length", 0) or 0)
+        except ValueError:
+            raise RequestError("Content-Length không hợp lệ") from None
+        if length < 0:
+            raise RequestError("Content-Length không hợp lệ")
+        if length:
+            await reader.readexactly(length)
+        return method, target, headers
+
+    async def dispatch(self, method, target, writer, keep_alive):
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        if method != "GET":
+            raise RequestError(f"Chỉ hỗ trợ GET, không hỗ trợ {method}", 405)
+        timeout = self.timeout
+        if "timeout" in query:
+            try:
+                timeout = min(float(query["timeout"][-1]), MAX_TIMEOUT)
+            except ValueError:
+                raise RequestError("Tham số timeout phải là số") from None
+        if url.path == "/health":
+            await self.send_json(writer, 200, {"status": "ok", "workers": self.workers}, keep_alive)
+        elif url.path == "/stats":
+            await self.send_json(writer, 200, dict(self.stats, inflight=len(self.inflight)), keep_alive)
+        elif url.path == "/count":
+            num_queens = _int_param(query, "n", required=True)
+            fixed = _parse_cells(query.get("fix", []))
+            blocked = _parse_cells(query.get("block", []))
+            if num_queens >= len(KNOWN_COUNTS) and not _bool_param(query, "long"):
+                raise RequestError(f"N = {num_queens} nằm ngoài bảng số lời giải đã biết (N <= "
+                                   f"{len(KNOWN_COUNTS) - 1}); thêm long=1 để vẫn tính")
+            total = await asyncio.wait_for(
+                self.compute(("count", num_queens, fixed, blocked), _count_task, num_queens, fixed, blocked),
+                timeout)
+            await self.send_json(writer, 200, {"n": num_queens, "count": total}, keep_alive)
+        elif url.path == "/first":
+            num_queens = _int_param(query, "n", required=True)
+            method_name = query.get("method", ["min-conflicts"])[-1]
+            seed = _int_param(query, "seed")
+            solution = await asyncio.wait_for(
+                self.compute(("first", num_queens, method_name, seed), _first_task, num_queens, method_name, seed),
+                timeout)
+            await self.send_json(writer, 200, {"n": num_queens, "method": method_name, "solution": solution},
+                                 keep_alive)
+        elif url.path == "/solve":
+            await self.stream_solutions(query, writer, keep_alive, timeout)
+        else:
+            raise RequestError(f"Không có endpoint {url.path}", 404)
+
+    # Các lô lời giải theo thứ tự; mỗi lô là các lời giải của một tiền tố (không
+    # ràng buộc) hoặc của một đơn vị split_fixed (có fix/block). Chỉ tối đa
+    # 2 * workers đơn vị được tính trước.
+    async def solution_batches(self, num_queens, fixed, blocked, limit):
+        if num_queens < 0:
+            return
+        depth = _solve_depth(num_queens)
+        if fixed or blocked:
+            units = [(("complete", num_queens, unit, blocked, limit), _complete_task,
+                      (num_queens, unit, blocked, limit))
+                     for unit in split_fixed(num_queens, fixed, set(blocked), depth)]
+        else:
+            units = [(("solve", num_queens, prefix), solve_prefix, (num_queens, prefix))
+                     for prefix in enumerate_prefixes(num_queens, depth)]
+        window = self.workers * 2
+        tasks = []
+        try:
+            for key, func, args in units:
+                tasks.append(asyncio.ensure_future(self.compute(key, func, *args)))
+                if len(tasks) >= window:
+                    yield await tasks.pop(0)
+            while tasks:
+                yield await tasks.pop(0)
+        finally:
+            # Client ngắt kết nối / đã đủ limit / hết giờ: bỏ các tiền tố chưa dùng
+            for task in tasks:
+                task.cancel()
+
+    async def stream_solutions(self, query, writer, keep_alive, timeout):
+        num_queens = _int_param(query, "n", required=True)
+        limit = _int_param(query, "limit")
+        fixed = _parse_cells(query.get("fix", []))
+        blocked = _parse_cells(query.get("block", []))
+        output_format = query.get("format", ["ndjson"])[-1]
+        if output_format not in ("ndjson", "binary"):
+            raise RequestError(f"Định dạng không hợp lệ: {output_format!r} (ndjson hoặc binary)")
+        if limit is not None and limit <= 0:
+            limit = 0
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        batches = self.solution_batches(num_queens, fixed, blocked, limit)
+        head_sent = False
+        try:
+            # Chờ lô đầu tiên trước khi gửi header để hết giờ vẫn trả được 504
+            batch = [] if limit == 0 else await asyncio.wait_for(anext(batches, None), timeout)
+            content_type = "application/x-ndjson" if output_format == "ndjson" else "application/octet-stream"
+            extra = {"X-Queens-N": str(num_queens)} if output_format == "binary" else {}
+            self.send_head(writer, 200, content_type, keep_alive, chunked=True, extra=extra)
+            head_sent = True
+            sent = 0
+            while batch is not None:
+                if limit is not None:
+                    batch = batch[:limit - sent]
+                for start in range(0, len(batch), STREAM_BATCH):
+                    await self.write_chunk(writer, _encode(batch[start:start + STREAM_BATCH], output_format))
+                sent += len(batch)
+                if limit is not None and sent >= limit:
+                    break
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError
+                batch = await asyncio.wait_for(anext(batches, None), remaining)
+            await self.write_chunk(writer, b"")
+        except asyncio.TimeoutError:
+            if not head_sent:
+                raise
+            # Header đã gửi nên không đổi được mã trạng thái: báo lỗi trong luồng
+            # (NDJSON) rồi đóng kết nối mà không gửi khối kết thúc
+            self.stats["timeouts"] += 1
+            if output_format == "ndjson":
+                await self.write_chunk(writer, b'{"error": "timeout"}\n')
+            raise _StreamAborted() from None
+        finally:
+            await batches.aclose()
+
+    def send_head(self, writer, status, content_type, keep_alive, length=None, chunked=False, extra=None):
+        lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}", f"Content-Type: {content_type}"]
+        if chunked:
+            lines.append("Transfer-Encoding: chunked")
+        else:
+            lines.append(f"Content-Length: {length}")
+        lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+        for name, value in (extra or {}).items():
+            lines.append(f"{name}: {value}")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+
+    async def send_json(self, writer, status, data, keep_alive):
+        body = json.dumps(data).encode()
+        self.send_head(writer, status, "application/json", keep_alive, length=len(body))
+        writer.write(body)
+        await writer.drain()
+
+    async def write_chunk(self, writer, data):
+        writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        # Backpressure: chờ khi bộ đệm ghi vượt WRITE_BUFFER_HIGH
+        await writer.drain()
+
+async def start_server(service, host="127.0.0.1", port=DEFAULT_PORT, unix_path=None):
+    """Khởi động process pool và máy chủ; trả về asyncio.Server"""
+    await service.start()
+    if unix_path:
+        return await asyncio.start_unix_server(service.handle_connection, path=unix_path)
+    return await asyncio.start_server(service.handle_connection, host, port)
+
+async def serve(host="127.0.0.1", port=DEFAULT_PORT, unix_path=None, workers=None, timeout=DEFAULT_TIMEOUT):
+    service = SolverService(workers, timeout)
+    server = await start_server(service, host, port, unix_path)
+    where = unix_path or "http://{}:{}".format(*server.sockets[0].getsockname()[:2])
+    print(f"Dang phuc vu tai {where} voi {service.workers} tien trinh")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dịch vụ giải N quân hậu cục bộ (HTTP/Unix socket)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", default=None, metavar="PATH", help="nghe trên Unix socket thay vì TCP")
+    parser.add_argument("--workers", type=int, default=None, help="số tiến trình giải (mặc định: số CPU)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="thời gian tối đa mỗi yêu cầu (giây)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.workers, args.timeout))
+    except KeyboardInterrupt:
+        pass
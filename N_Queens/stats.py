@@ -0,0 +1,168 @@
+# Thống kê quá trình tìm kiếm: số nút và số ứng viên bị loại theo từng độ sâu,
+# số lần quay lui, thời gian tới lời giải đầu tiên, số lời giải mỗi giây.
+#
+# Các engine thường (engines.py) không bị động tới: khi không truyền `stats`,
+# solve()/count() chạy đúng đoạn mã cũ nên không tốn thêm chi phí nào. Khi có
+# `stats`, instrumented_search() chạy một bản sao của engine bitmask có đếm;
+# cách chia hàng đầu của count() lấy từ engines.half_board_columns nên hai bên
+# luôn duyệt cùng một cây.
+import json
+import time
+
+from engines import half_board_columns
+
+class SearchStats:
+    """Bộ đếm của một lần tìm kiếm; callback(stats) được gọi sau mỗi `every` nút."""
+
+    def __init__(self, callback=None, every=100_000):
+        self.callback = callback
+        self.every = every
+        self.reset(0)
+
+    def reset(self, num_queens):
+        self.num_queens = num_queens
+        # nodes[d]: số nút được mở ở độ sâu d (đã đặt d quân hậu)
+        self.nodes = [0] * (num_queens + 1)
+        # pruned[d]: số cột bị loại vì bị tấn công khi mở các nút ở độ sâu d
+        self.pruned = [0] * (num_queens + 1)
+        self.backtracks = 0
+        # solutions: số lời giải của bài toán; ở mode "count" là tổng đã nhân đôi
+        # nửa trái, còn nodes/pruned chỉ tính cây nửa trái thật sự được duyệt.
+        # solutions_visited: số lá lời giải trong cây đã duyệt (có sau khi tìm xong)
+        self.solutions = 0
+        self.solutions_visited = 0
+        self.started = time.perf_counter()
+        self.finished = None
+        self.first_solution_at = None
+
+    @property
+    def total_nodes(self):
+        return sum(self.nodes)
+
+    @property
+    def elapsed(self):
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return end - self.started
+
+    @property
+    def time_to_first_solution(self):
+        if self.first_solution_at is None:
+            return None
+        return self.first_solution_at - self.started
+
+    @property
+    def solutions_per_second(self):
+        elapsed = self.elapsed
+        return self.solutions / elapsed if elapsed > 0 else 0.0
+
+    def to_dict(self):
+        return {
+            "num_queens": self.num_queens,
+            "nodes_total": self.total_nodes,
+            "nodes_per_depth": self.nodes,
+            "pruned_per_depth": self.pruned,
+            "backtracks": self.backtracks,
+            "solutions": self.solutions,
+            "solutions_visited": self.solutions_visited,
+            "elapsed_seconds": self.elapsed,
+            "time_to_first_solution_seconds": self.time_to_first_solution,
+            "solutions_per_second": self.solutions_per_second,
+        }
+
+    def to_json(self, indent=None):
+        return json.dumps(self.to_dict(), indent=indent)
+
+    # Định dạng text của Prometheus (exposition format)
+    def to_prometheus(self, prefix="nqueens"):
+        label = f'n="{self.num_queens}"'
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{prefix}_{name}{{{labels}}} {value}")
+
+        metric("nodes_total", "counter",
+               "Search nodes expanded per depth (count mode: only the half-board tree that is searched).",
+               [(f'{label},depth="{d}"', v) for d, v in enumerate(self.nodes)])
+        metric("pruned_total", "counter", "Candidate columns pruned per depth.",
+               [(f'{label},depth="{d}"', v) for d, v in enumerate(self.pruned)])
+        metric("backtracks_total", "counter", "Queens removed while backtracking.",
+               [(label, self.backtracks)])
+        metric("solutions_total", "counter",
+               "Solutions of the problem (count mode: mirrored total, not only the searched tree).",
+               [(label, self.solutions)])
+        metric("solutions_visited_total", "counter", "Solution leaves reached in the searched tree.",
+               [(label, self.solutions_visited)])
+        metric("elapsed_seconds", "gauge", "Wall time of the search.", [(label, self.elapsed)])
+        if self.time_to_first_solution is not None:
+            metric("time_to_first_solution_seconds", "gauge", "Wall time until the first solution.",
+                   [(label, self.time_to_first_solution)])
+        metric("solutions_per_second", "gauge", "Solutions found per second.",
+               [(label, self.solutions_per_second)])
+        return "\n".join(lines) + "\n"
+
+def instrumented_search(num_queens, stats, mode="all", solutions=None):
+    """Engine bitmask có đếm. mode: "all" (lưu vào `solutions` nếu có),
+    "count" (chỉ duyệt nửa trái hàng đầu như count()), "first" (dừng ở lời giải đầu)."""
+    stats.reset(max(num_queens, 0))
+    if num_queens < 0:
+        stats.finished = time.perf_counter()
+        return 0
+    full = (1 << num_queens) - 1
+    nodes, pruned = stats.nodes, stats.pruned
+    callback, every = stats.callback, stats.every
+    state = []
+    stop_at_first = mode == "first"
+    expanded = 0
+
+    # Trả về số lời giải trong nhánh; mode "first" dừng ngay khi có lời giải
+    def place(depth, cols, diag1, diag2):
+        nonlocal expanded
+        nodes[depth] += 1
+        expanded += 1
+        if callback is not None and expanded % every == 0:
+            callback(stats)
+        if cols == full:
+            stats.solutions += 1
+            if stats.first_solution_at is None:
+                stats.first_solution_at = time.perf_counter()
+            if solutions is not None:
+                solutions.append(state.copy())
+            return 1
+        available = full & ~(cols | diag1 | diag2)
+        pruned[depth] += num_queens - available.bit_count()
+        total = 0
+        while available:
+            bit = available & -available
+            available ^= bit
+            state.append(bit.bit_length() - 1)
+            found = place(depth + 1, cols | bit, ((diag1 | bit) << 1) & full, (diag2 | bit) >> 1)
+            state.pop()
+            stats.backtracks += 1
+            if stop_at_first and stats.solutions:
+                return found
+            total += found
+        return total
+
+    if mode == "count" and num_queens > 0:
+        # Giống count(): chỉ duyệt các cột hàng đầu của half_board_columns
+        nodes[0] += 1
+        expanded += 1
+        total = 0
+        for col, weight in half_board_columns(num_queens):
+            bit = 1 << col
+            state.append(col)
+            found = place(1, bit, (bit << 1) & full, bit >> 1)
+            state.pop()
+            stats.backtracks += 1
+            total += found * weight
+        # Lá đã duyệt (chưa nhân), cùng cây với nodes/pruned
+        stats.solutions_visited = stats.solutions
+        stats.solutions = total
+    else:
+        total = place(0, 0, 0, 0)
+        stats.solutions_visited = stats.solutions
+    stats.finished = time.perf_counter()
+    return total
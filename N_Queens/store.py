@@ -0,0 +1,218 @@
+# Lưu trữ tập lời giải dưới dạng file nhị phân gọn, đọc lại bằng np.memmap.
+#
+# Định dạng file (little-endian):
+#   header 32 byte: magic "NQS1", version (uint16), encoding (uint8),
+#                   reserved (uint8), N (uint32), flags (uint32), count (uint64)
+#   dữ liệu: `count` bản ghi liên tiếp, mỗi bản ghi là một lời giải
+#     - encoding "cols": N chỉ số cột kiểu uint8 (N <= 256) hoặc uint16
+#     - encoding "rank": thứ hạng hoán vị theo thứ tự từ điển, uint64 (N <= 20)
+# Thứ hạng hoán vị giữ nguyên thứ tự từ điển, nên cả hai cách mã hóa đều lưu
+# lời giải theo đúng thứ tự sinh ra của solve().
+#
+# Cách chạy:  python store.py write N file [--encoding cols|rank]
+#             python store.py info file
+import argparse
+import struct
+from math import factorial
+
+import numpy as np
+
+from engines import iter_solutions
+from symmetry import fundamental_solutions
+
+MAGIC = b"NQS1"
+VERSION = 1
+HEADER = struct.Struct("<4sHBBIIQ")
+HEADER_SIZE = 32
+
+ENCODINGS = {"cols": 0, "rank": 1}
+# Cờ đối xứng trong header
+FLAG_FUNDAMENTAL = 1  # chỉ lưu các lời giải khác nhau qua phép quay/lật
+# Số lời giải được gom lại trước mỗi lần ghi xuống file
+WRITE_BATCH = 4096
+# 20! < 2^64 nên thứ hạng của hoán vị tối đa 20 phần tử vừa với uint64
+MAX_RANK_QUEENS = 20
+
+# Kiểu dữ liệu của một bản ghi theo N và cách mã hóa
+def record_dtype(num_queens, encoding):
+    if encoding == "rank":
+        if num_queens > MAX_RANK_QUEENS:
+            raise ValueError(f"Mã hóa 'rank' chỉ hỗ trợ N <= {MAX_RANK_QUEENS}")
+        return np.dtype("<u8")
+    if encoding == "cols":
+        return np.dtype(np.uint8 if num_queens <= 256 else "<u2")
+    raise ValueError(f"Cách mã hóa không hợp lệ: {encoding!r} (chọn một trong {sorted(ENCODINGS)})")
+
+# Thứ hạng từ điển của các hoán vị (S, N) -> (S,) uint64 (mã Lehmer)
+def rank_permutations(perms):
+    perms = np.asarray(perms, dtype=np.int64)
+    num_queens = perms.shape[1]
+    ranks = np.zeros(len(perms), dtype=np.uint64)
+    for i in range(num_queens):
+        # Số phần tử phía sau nhỏ hơn phần tử thứ i
+        digit = (perms[:, i + 1:] < perms[:, i:i + 1]).sum(axis=1).astype(np.uint64)
+        ranks += digit * np.uint64(factorial(num_queens - 1 - i))
+    return ranks
+
+# Khôi phục các hoán vị (S, N) từ thứ hạng từ điển
+def unrank_permutations(ranks, num_queens):
+    ranks = np.asarray(ranks, dtype=np.uint64)
+    perms = np.empty((len(ranks), num_queens), dtype=np.int64)
+    for i in range(num_queens):
+        weight = np.uint64(factorial(num_queens - 1 - i))
+        perms[:, i] = (ranks // weight) % np.uint64(num_queens - i)
+    # Đổi mã Lehmer thành hoán vị: duyệt từ phải sang trái, mỗi phần tử phía sau
+    # lớn hơn hoặc bằng phần tử đang xét thì tăng thêm 1
+    for i in range(num_queens - 2, -1, -1):
+        tail = perms[:, i + 1:]
+        tail += tail >= perms[:, i:i + 1]
+    return perms
+
+class SolutionWriter:
+    """Ghi lần lượt các lời giải vào file; số lượng được cập nhật khi đóng file."""
+
+    def __init__(self, path, num_queens, encoding="cols", flags=0):
+        self.path = path
+        self.num_queens = num_queens
+        self.encoding = encoding
+        self.flags = flags
+        self.dtype = record_dtype(num_queens, encoding)
+        self.count = 0
+        self.pending = []
+        self.file = open(path, "wb")
+        self._write_header()
+
+    def _write_header(self):
+        header = HEADER.pack(MAGIC, VERSION, ENCODINGS[self.encoding], 0,
+                             self.num_queens, self.flags, self.count)
+        self.file.seek(0)
+        self.file.write(header.ljust(HEADER_SIZE, b"\0"))
+
+    def write(self, solution):
+        self.pending.append(solution)
+        if len(self.pending) >= WRITE_BATCH:
+            self.flush()
+
+    def write_batch(self, solutions):
+        self.flush()
+        solutions = np.asarray(solutions, dtype=np.int64).reshape(len(solutions), self.num_queens)
+        if self.encoding == "rank":
+            records = rank_permutations(solutions)
+        else:
+            records = solutions
+        self.file.write(records.astype(self.dtype).tobytes())
+        self.count += len(solutions)
+
+    def flush(self):
+        if self.pending:
+            pending, self.pending = self.pending, []
+            self.write_batch(pending)
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.flush()
+        self._write_header()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class SolutionStore:
+    """Đọc file lời giải qua np.memmap: cắt lát, truy cập ngẫu nhiên, lọc mà không nạp cả file."""
+
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            header = file.read(HEADER_SIZE)
+        if len(header) < HEADER_SIZE:
+            raise ValueError(f"File lời giải không hợp lệ: {path}")
+        magic, version, encoding, _, num_queens, flags, count = HEADER.unpack_from(header)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"File lời giải không hợp lệ: {path}")
+        self.path = path
+        self.num_queens = num_queens
+        self.flags = flags
+        self.count = count
+        self.encoding = {code: name for name, code in ENCODINGS.items()}[encoding]
+        dtype = record_dtype(num_queens, self.encoding)
+        shape = (count,) if self.encoding == "rank" else (count, num_queens)
+        if count == 0 or (num_queens == 0 and self.encoding == "cols"):
+            self.records = np.zeros(shape, dtype=dtype)
+        else:
+            self.records = np.memmap(path, dtype=dtype, mode="r", offset=HEADER_SIZE, shape=shape)
+
+    def __len__(self):
+        return self.count
+
+    # Giải mã các bản ghi đã chọn thành mảng cột (k, N) hoặc (N,)
+    def _decode(self, records):
+        if self.encoding == "rank":
+            single = records.ndim == 0
+            perms = unrank_permutations(np.atleast_1d(records), self.num_queens)
+            return perms[0] if single else perms
+        return np.asarray(records, dtype=np.int64)
+
+    def __getitem__(self, index):
+        return self._decode(self.records[index])
+
+    # Lọc theo một hàm nhận lô (k, N) và trả về mặt nạ bool (k,)
+    def filter(self, predicate, batch_size=1 << 16):
+        selected = []
+        for start in range(0, self.count, batch_size):
+            batch = self[start:start + batch_size]
+            selected.append(batch[predicate(batch)])
+        if not selected:
+            return np.zeros((0, self.num_queens), dtype=np.int64)
+        return np.concatenate(selected)
+
+    # Duyệt từng lô, mỗi lô là mảng (k, N)
+    def iter_batches(self, batch_size=1 << 16):
+        for start in range(0, self.count, batch_size):
+            yield self[start:start + batch_size]
+
+    def tolist(self):
+        return [solution.tolist() for batch in self.iter_batches() for solution in batch]
+
+# Ghi toàn bộ lời giải của bài toán num_queens (sinh lần lượt, không giữ trong bộ nhớ)
+def save_solutions(path, num_queens, solutions=None, encoding="cols", flags=0):
+    if solutions is None:
+        solutions = iter_solutions(num_queens)
+    with SolutionWriter(path, num_queens, encoding, flags) as writer:
+        for solution in solutions:
+            writer.write(solution)
+    return writer.count
+
+def load_solutions(path):
+    return SolutionStore(path)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Lưu/đọc file lời giải N quân hậu")
+    commands = parser.add_subparsers(dest="command", required=True)
+    write_parser = commands.add_parser("write", help="giải và ghi mọi lời giải ra file")
+    write_parser.add_argument("num_queens", type=int)
+    write_parser.add_argument("path")
+    write_parser.add_argument("--encoding", choices=sorted(ENCODINGS), default="cols")
+    write_parser.add_argument("--fundamental", action="store_true",
+                              help="chỉ ghi các lời giải cơ bản (đặt cờ FLAG_FUNDAMENTAL)")
+    info_parser = commands.add_parser("info", help="xem thông tin file lời giải")
+    info_parser.add_argument("path")
+    info_parser.add_argument("--head", type=int, default=3, help="số lời giải đầu tiên cần in")
+    args = parser.parse_args()
+
+    if args.command == "write":
+        if args.fundamental:
+            solutions = (solution for solution, _ in fundamental_solutions(args.num_queens))
+            total = save_solutions(args.path, args.num_queens, solutions,
+                                   encoding=args.encoding, flags=FLAG_FUNDAMENTAL)
+        else:
+            total = save_solutions(args.path, args.num_queens, encoding=args.encoding)
+        print(f"Đã ghi {total} lời giải vào {args.path}")
+    else:
+        store = load_solutions(args.path)
+        print(f"N = {store.num_queens}, số lời giải = {store.count}, "
+              f"mã hóa = {store.encoding}, cờ = {store.flags}")
+        for index, solution in enumerate(store[:args.head], start=1):
+            print(f"Loi giai {index}: {solution.tolist()}")
@@ -0,0 +1,167 @@
+# Liệt kê các lời giải cơ bản: mỗi lớp lời giải tương đương qua 8 phép quay/lật
+# (nhóm nhị diện D4) chỉ giữ lại một đại diện, là ảnh nhỏ nhất theo thứ tự từ điển.
+#
+# Việc cắt tỉa diễn ra ngay trong lúc tìm kiếm: với mỗi tiền tố, ảnh của phần
+# bàn cờ đã biết qua từng phép biến đổi được so sánh với tiền tố; nếu chắc
+# chắn ảnh nhỏ hơn thì mọi lời giải mở rộng từ tiền tố đều không phải đại diện
+# và cả nhánh bị bỏ. Ở lá, đại diện được kiểm tra đầy đủ với cả 8 ảnh và kích
+# thước quỹ đạo (1, 2, 4 hoặc 8) được trả kèm để dựng lại tổng số lời giải.
+#
+# Cách chạy:  python symmetry.py N
+import sys
+
+# Một quân hậu ở (r, c) trên bàn n x n, m = n - 1, đi tới:
+#   rot90 (c, m-r)   rot180 (m-r, m-c)   rot270 (m-c, r)
+#   lật cột (r, m-c) lật hàng (m-r, c)   chuyển vị (c, r)   chuyển vị phụ (m-c, m-r)
+TRANSFORMS = ("rot90", "rot180", "rot270", "mirror", "flip", "transpose", "antitranspose")
+
+# Ảnh đầy đủ của một lời giải qua một phép biến đổi
+def transform(solution, name):
+    n = len(solution)
+    m = n - 1
+    image = [0] * n
+    for r, c in enumerate(solution):
+        if name == "rot90":
+            image[c] = m - r
+        elif name == "rot180":
+            image[m - r] = m - c
+        elif name == "rot270":
+            image[m - c] = r
+        elif name == "mirror":
+            image[r] = m - c
+        elif name == "flip":
+            image[m - r] = c
+        elif name == "transpose":
+            image[c] = r
+        elif name == "antitranspose":
+            image[m - c] = m - r
+        else:
+            raise ValueError(f"Phép biến đổi không hợp lệ: {name!r}")
+    return image
+
+# Toàn bộ quỹ đạo (các ảnh khác nhau) của một lời giải
+def orbit(solution):
+    images = {tuple(solution)}
+    for name in TRANSFORMS:
+        images.add(tuple(transform(solution, name)))
+    return images
+
+# Dạng chuẩn: ảnh nhỏ nhất theo thứ tự từ điển
+def canonical(solution):
+    return list(min(orbit(solution)))
+
+# Cách đọc ảnh[i] của từng phép biến đổi (cùng thứ tự với TRANSFORMS), dạng
+# (theo cột, đọc từ phải, lấy bù): với x = m - i nếu đọc từ phải, ngược lại x = i,
+# ảnh[i] là pos[x] (hàng của quân hậu ở cột x) nếu theo cột, ngược lại state[x];
+# lấy bù thì thay v bằng m - v.
+IMAGE_RULES = (
+    (True, False, True),    # rot90:  ảnh[i] = m - pos[i]
+    (False, True, True),    # rot180: ảnh[i] = m - state[m - i]
+    (True, True, False),    # rot270: ảnh[i] = pos[m - i]
+    (False, False, True),   # mirror: ảnh[i] = m - state[i]
+    (False, True, False),   # flip:   ảnh[i] = state[m - i]
+    (True, False, False),   # transpose:     ảnh[i] = pos[i]
+    (True, True, True),     # antitranspose: ảnh[i] = m - pos[m - i]
+)
+# Kết quả của _advance khi ảnh chắc chắn lớn hơn lời giải (phép biến đổi không
+# còn tỉa được nhánh này nữa)
+DECIDED = -1
+
+# So sánh tiếp ảnh qua một phép biến đổi với tiền tố state, bắt đầu từ vị trí j
+# (ảnh[:j] == state[:j] đã biết từ các hàng trước). Trả về None nếu ảnh chắc
+# chắn nhỏ hơn (tỉa nhánh), DECIDED nếu chắc chắn lớn hơn, ngược lại là vị trí
+# đầu tiên chưa so sánh được. Giá trị ảnh chưa biết được thay bằng khoảng của nó:
+# quân hậu ở hàng chưa đặt nằm ở một cột chưa dùng [unused_min, unused_max],
+# cột chưa có quân hậu thì quân hậu đó ở một hàng >= k.
+def _advance(rule, j, state, pos, m, unused_min, unused_max):
+    by_column, from_right, reverse = rule
+    k = len(state)
+    while j < k:
+        x = m - j if from_right else j
+        if by_column:
+            value = pos[x]
+            if value < 0:
+                low, high = (0, m - k) if reverse else (k, m)
+                break
+        elif x < k:
+            value = state[x]
+        else:
+            low, high = (m - unused_max, m - unused_min) if reverse else (unused_min, unused_max)
+            break
+        if reverse:
+            value = m - value
+        if value != state[j]:
+            return DECIDED if value > state[j] else None
+        j += 1
+    else:
+        return j
+    if high < state[j]:
+        return None
+    if low > state[j]:
+        return DECIDED
+    return j
+
+# Danh sách (lời giải cơ bản, kích thước quỹ đạo) theo thứ tự từ điển.
+# Mỗi nút mang theo các phép biến đổi còn "hòa" với tiền tố kèm vị trí đã so
+# sánh tới, nên khi đặt thêm một quân chỉ phải so sánh các vị trí ảnh vừa biết
+# thêm; phép biến đổi đã chắc chắn cho ảnh lớn hơn bị bỏ khỏi danh sách. Ở lá,
+# các phép biến đổi còn hòa chính là các phép giữ nguyên lời giải, nên quỹ đạo
+# có 8 / (1 + số phép đó) phần tử.
+def fundamental_solutions(num_queens):
+    if num_queens < 0:
+        return []
+    if num_queens == 0:
+        return [([], 1)]
+
+    full = (1 << num_queens) - 1
+    m = num_queens - 1
+    # Lật cột: ảnh[0] = m - state[0], nên quân hậu hàng 0 chỉ cần xét nửa trái (và cột giữa)
+    first_row = (1 << (m // 2 + 1)) - 1
+    state = []
+    pos = [-1] * num_queens
+    fundamentals = []
+
+    def place(cols, diag1, diag2, tied):
+        row = len(state)
+        available = full & ~(cols | diag1 | diag2)
+        if row == 0:
+            available &= first_row
+        while available:
+            bit = available & -available
+            available ^= bit
+            col = bit.bit_length() - 1
+            state.append(col)
+            pos[col] = row
+            next_cols = cols | bit
+            remaining = full & ~next_cols
+            unused_min = (remaining & -remaining).bit_length() - 1
+            unused_max = remaining.bit_length() - 1
+            next_tied = []
+            for rule, j in tied:
+                j = _advance(rule, j, state, pos, m, unused_min, unused_max)
+                if j is None:
+                    break
+                if j != DECIDED:
+                    next_tied.append((rule, j))
+            else:
+                if next_cols == full:
+                    fundamentals.append((state.copy(), 8 // (1 + len(next_tied))))
+                else:
+                    place(next_cols, ((diag1 | bit) << 1) & full, (diag2 | bit) >> 1, next_tied)
+            pos[col] = -1
+            state.pop()
+
+    place(0, 0, 0, [(rule, 0) for rule in IMAGE_RULES])
+    return fundamentals
+
+# Tổng số lời giải dựng lại từ các lời giải cơ bản
+def total_from_fundamental(fundamentals):
+    return sum(size for _, size in fundamentals)
+
+if __name__ == "__main__":
+    num_queens = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    fundamentals = fundamental_solutions(num_queens)
+    for index, (solution, size) in enumerate(fundamentals, start=1):
+        print(f"Loi giai co ban {index}: {solution} (quy dao {size})")
+    print(f"\n=> {len(fundamentals)} loi giai co ban, "
+          f"tong so loi giai: {total_from_fundamental(fundamentals)}")
@@ -0,0 +1,52 @@
+# Kiểm tra cache.py: kết quả trả về là bản sao, loại bỏ file ít dùng nhất.
+#
+# Cách chạy:  python -m pytest -q   (trong thư mục N_Queens)
+import os
+
+from cache import KNOWN_COUNTS, ResultCache, cached_count, cached_solve
+from engines import solve
+
+# Người gọi sửa kết quả không làm hỏng các lần tra sau (cả memo lẫn file)
+def test_results_are_copies(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    expected = solve(6)
+    first = cached_solve(6, cache=cache)
+    first[0][0] = 99
+    first.append([0])
+    assert cached_solve(6, cache=cache) == expected
+    assert ResultCache(str(tmp_path)).get(cache.make_key(6, "solve")) == expected
+
+def test_fixed_queens_key_is_order_independent(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    assert cached_count(8, [(0, 0), (4, 2)], cache=cache) == cached_count(8, [(4, 2), (0, 0)], cache=cache)
+    assert len(os.listdir(tmp_path)) == 1
+    # Không có quân đặt sẵn thì tra bảng, không ghi file
+    assert cached_count(10, cache=cache) == KNOWN_COUNTS[10]
+    assert len(os.listdir(tmp_path)) == 1
+
+# File có mtime cũ nhất bị xóa trước; get() từ đĩa đánh dấu file vừa được dùng
+def test_eviction_is_least_recently_used(tmp_path):
+    cache = ResultCache(str(tmp_path), memo_size=0)
+    keys = [cache.make_key(n, "count") for n in (1, 2, 3)]
+    for age, key in enumerate(keys):
+        cache.put(key, [0] * 100)
+        os.utime(cache._path(key), (1000 + age, 1000 + age))
+    size = os.path.getsize(cache._path(keys[0]))
+    assert cache.get(keys[0]) == [0] * 100
+    cache.max_bytes = 3 * size
+    cache.put(cache.make_key(4, "count"), [0] * 100)
+    assert not os.path.exists(cache._path(keys[1]))
+    assert os.path.exists(cache._path(keys[0])) and os.path.exists(cache._path(keys[2]))
+    assert cache.get(keys[1]) is None
+
+# Thư mục chỉ đọc: không cập nhật được mtime nhưng kết quả vẫn là một lần tra trúng
+def test_read_only_hit(tmp_path, monkeypatch):
+    cache = ResultCache(str(tmp_path), memo_size=0)
+    key = cache.make_key(5, "count")
+    cache.put(key, 10)
+
+    def refuse(*args, **kwargs):
+        raise PermissionError("read-only")
+
+    monkeypatch.setattr(os, "utime", refuse)
+    assert cache.get(key) == 10
@@ -0,0 +1,42 @@
+# Kiểm tra checkpoint.py: ngắt giữa chừng rồi chạy tiếp phải cho cùng tổng.
+#
+# Cách chạy:  python -m pytest -q   (trong thư mục N_Queens)
+import pytest
+
+import checkpoint
+from cache import KNOWN_COUNTS
+from engines import count
+
+# Ngắt giữa chừng (kể cả dòng journal bị ghi dở) rồi resume phải cho cùng tổng
+def test_checkpoint_resume_gives_same_total(tmp_path):
+    directory = str(tmp_path)
+    manifest = checkpoint.init_job(directory, 10, depth=2)
+    assert checkpoint.run_units(directory, max_units=3, verbose=False) == 3
+    status = checkpoint.job_status(directory)
+    assert status["completed"] == 3 and status["remaining"] == manifest["num_units"] - 3
+    with pytest.raises(ValueError):
+        checkpoint.merge_results(directory)
+
+    # Tiến trình chết khi đang ghi một dòng: dòng dở bị bỏ qua khi đọc lại
+    journal = next(tmp_path.glob(f"{checkpoint.JOURNAL_PREFIX}*.ndjson"))
+    with open(journal, "a", encoding="utf-8") as file:
+        file.write('{"unit": 5, "prefix": [0, 2], "cou')
+
+    checkpoint.run_units(directory, host="resume", verbose=False)
+    assert checkpoint.job_status(directory)["remaining"] == 0
+    result = checkpoint.merge_results(directory, verify_sample=2, seed=0)
+    assert result["count"] == count(10) == KNOWN_COUNTS[10]
+
+# Hai máy chạy hai shard rời nhau của cùng thư mục rồi merge
+def test_checkpoint_shards_merge(tmp_path):
+    directory = str(tmp_path)
+    checkpoint.init_job(directory, 9, depth=3)
+    shards = checkpoint.plan_shards(directory, 2)
+    num_units = checkpoint.load_manifest(directory)["num_units"]
+    assert sorted(unit for shard in shards for unit in shard) == list(range(num_units))
+    for index in range(2):
+        checkpoint.run_units(directory, shard=f"{index}/2", host=f"host{index}", verbose=False)
+    assert checkpoint.merge_results(directory)["count"] == count(9)
+    # Gọi lại init với tham số khác bị từ chối
+    with pytest.raises(ValueError):
+        checkpoint.init_job(directory, 9, depth=2)
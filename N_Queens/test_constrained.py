@@ -0,0 +1,57 @@
+# Kiểm tra constrained.py: kết quả khớp với lọc vét cạn mọi lời giải.
+#
+# Cách chạy:  python -m pytest -q   (trong thư mục N_Queens)
+import numpy as np
+import pytest
+
+from constrained import blocked_rows, complete, count_completions, infeasible_reason, split_fixed
+from engines import solve
+
+CASES = [
+    (6, [], set()),
+    (6, [(1, 3)], set()),
+    (8, [(0, 0)], {(1, 2), (5, 5)}),
+    (8, [(4, 4), (7, 1)], {(0, 3)}),
+    (8, [], {(r, r) for r in range(8)}),
+    (8, [(0, 0), (1, 1)], set()),
+]
+
+def brute_force(num_queens, fixed, blocked):
+    return [solution for solution in solve(num_queens)
+            if all(solution[r] == c for r, c in fixed)
+            and not any(solution[r] == c for r, c in blocked)]
+
+@pytest.mark.parametrize("num_queens, fixed, blocked", CASES)
+def test_constrained_matches_brute_force(num_queens, fixed, blocked):
+    expected = brute_force(num_queens, fixed, blocked)
+    assert sorted(complete(num_queens, fixed, blocked)) == expected
+    assert count_completions(num_queens, fixed, blocked) == len(expected)
+
+@pytest.mark.parametrize("num_queens, fixed, blocked", CASES)
+def test_split_fixed_reproduces_complete_order(num_queens, fixed, blocked):
+    units = split_fixed(num_queens, fixed, blocked, depth=2)
+    joined = [solution for unit in units for solution in complete(num_queens, unit, blocked)]
+    assert joined == list(complete(num_queens, fixed, blocked))
+
+# Ô cấm truyền dạng danh sách cặp (như `fixed`), tập cặp hay lưới bool đều như nhau
+def test_blocked_cells_as_list_set_or_grid():
+    blocked = [(3, 3), (0, 5)]
+    grid = np.zeros((8, 8), dtype=bool)
+    for r, c in blocked:
+        grid[r, c] = True
+    expected = len(brute_force(8, [], blocked))
+    for form in (blocked, set(blocked), tuple(blocked), grid, grid.tolist(), np.array(blocked)):
+        assert count_completions(8, [], form) == expected
+    assert infeasible_reason(8, [(0, 0)], [(3, 3)]) is None
+    assert infeasible_reason(8, [(3, 3)], [(3, 3)]) is not None
+
+@pytest.mark.parametrize("blocked", [
+    [(1, 2, 3)],
+    [[1, 0] * 4] * 8,
+    np.zeros((8, 8), dtype=int),
+    np.zeros((4, 4), dtype=bool),
+    [(True, False)],
+])
+def test_ambiguous_blocked_is_rejected(blocked):
+    with pytest.raises(ValueError):
+        blocked_rows(8, blocked)
@@ -0,0 +1,23 @@
+# Kiểm tra constructive.py: lời giải dựng bằng công thức luôn hợp lệ.
+#
+# Cách chạy:  python -m pytest -q   (trong thư mục N_Queens)
+import numpy as np
+import pytest
+
+from constructive import construct
+from validation import is_valid_placement
+
+@pytest.mark.parametrize("num_queens", [n for n in range(0, 60) if n not in (2, 3)])
+def test_construct_is_valid(num_queens):
+    cols = construct(num_queens)
+    assert cols.dtype == np.int32 and len(cols) == num_queens
+    assert is_valid_placement(cols, num_queens)
+
+# Đủ mọi số dư theo mod 6 với N lớn
+@pytest.mark.parametrize("num_queens", range(100_000, 100_006))
+def test_construct_large_n(num_queens):
+    assert is_valid_placement(construct(num_queens))
+
+@pytest.mark.parametrize("num_queens", [-1, 2, 3])
+def test_construct_without_solution(num_queens):
+    assert construct(num_queens) is None
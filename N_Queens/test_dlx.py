@@ -0,0 +1,29 @@
+# Kiểm tra dlx.py: số lời giải của các biến thể và khớp với engine quay lui.
+#
+# Cách chạy:  python -m pytest -q   (trong thư mục N_Queens)
+import pytest
+
+from constrained import count_completions
+from dlx import count_dlx, dlx_solutions
+from engines import count, solve
+
+@pytest.mark.parametrize("num_queens", range(0, 10))
+def test_standard_matches_backtracking(num_queens):
+    assert solve(num_queens, engine="dlx") == solve(num_queens)
+    assert count_dlx(num_queens) == count(num_queens)
+
+# Bàn cờ hình xuyến (OEIS A051906) và superqueen (OEIS A051223)
+def test_variant_counts():
+    assert [count_dlx(n, "toroidal") for n in range(1, 8)] == [1, 0, 0, 0, 10, 0, 28]
+    assert [count_dlx(n, "superqueen") for n in range(1, 11)] == [1] + [0] * 8 + [4]
+
+# Ô bị khoét tương đương với ô cấm của constrained.py
+def test_holes_match_blocked_cells():
+    holes = [(0, 0), (3, 4), (7, 7)]
+    assert count_dlx(8, holes=holes) == count_completions(8, [], holes)
+
+def test_prefix_and_invalid_variant():
+    assert sorted(dlx_solutions(8, prefix=(0, 4))) == [s for s in solve(8) if s[:2] == [0, 4]]
+    assert list(dlx_solutions(8, prefix=(0, 1))) == []
+    with pytest.raises(ValueError):
+        count_dlx(8, "knight")
@@ -0,0 +1,35 @@
+# Kiểm tra iter_solutions() của engines.py: cùng thứ tự với solve(), dừng và
+# tiếp tục từ một tiền tố.
+#
+# Cách chạy:  python -m pytest -q   (trong thư mục N_Queens)
+import random
+
+import pytest
+
+from engines import iter_solutions, solve
+
+@pytest.mark.parametrize("num_queens", range(0, 9))
+def test_iter_solutions_matches_solve(num_queens):
+    assert list(iter_solutions(num_queens)) == solve(num_queens)
+
+def test_iter_solutions_start_prefix():
+    solutions = solve(8)
+    assert list(iter_solutions(8)) == solutions
+    rand = random.Random(0)
+    # Tiền tố lấy từ lời giải, lời giải hoàn chỉnh và tiền tố không hợp lệ (xung đột)
+    prefixes = [solution[:rand.randint(1, 8)] for solution in rand.sample(solutions, 10)]
+    prefixes += [[0, 1], [3, 3, 3], [7, 6], [0], [7]]
+    for prefix in prefixes:
+        expected = [solution for solution in solutions if solution >= prefix]
+        assert list(iter_solutions(8, start_prefix=prefix)) == expected
+        assert list(iter_solutions(8, limit=3, start_prefix=prefix)) == expected[:3]
+
+# Tiếp tục từ lời giải cuối cùng đã nhận (như khi resume) không bỏ sót, không lặp
+def test_iter_solutions_resume_in_batches():
+    solutions = solve(8)
+    collected = list(iter_solutions(8, limit=10))
+    while len(collected) < len(solutions):
+        batch = list(iter_solutions(8, limit=11, start_prefix=collected[-1]))
+        assert batch[0] == collected[-1]
+        collected.extend(batch[1:])
+    assert collected == solutions
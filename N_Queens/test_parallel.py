@@ -0,0 +1,20 @@
+# Kiểm tra parallel.py: kết quả song song giống hệt chạy tuần tự.
+#
+# Cách chạy:  python -m pytest -q   (trong thư mục N_Queens)
+import pytest
+
+from engines import count, solve
+from parallel import enumerate_prefixes, parallel_count, parallel_solve
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parallel_matches_serial(workers):
+    for num_queens in (1, 4, 9):
+        assert parallel_count(num_queens, depth=2, workers=workers) == count(num_queens)
+    assert parallel_solve(8, depth=2, workers=workers) == solve(8)
+    assert parallel_solve(8, depth=3, workers=workers) == solve(8)
+
+# Các tiền tố hợp lệ theo thứ tự từ điển, đúng bằng các tiền tố của lời giải khi depth = N
+def test_prefixes_cover_the_tree():
+    prefixes = enumerate_prefixes(6, 6)
+    assert [list(prefix) for prefix in prefixes] == solve(6)
+    assert enumerate_prefixes(8, 2) == sorted(enumerate_prefixes(8, 2))
@@ -0,0 +1,42 @@
+# Kiểm tra search_trace.py: phát lại vết tìm kiếm cho đúng các bước theo định
+# dạng cũ của minh_hoa.py (danh sách tuple dựng bằng cách sao chép state).
+#
+# Cách chạy:  python -m pytest -q   (trong thư mục N_Queens)
+import pytest
+
+from engines import get_candidates, is_valid_state
+from search_trace import record_search
+
+# Cách làm cũ: ghi mọi bước ("trying", state, col), ("backtrack", state),
+# ("solution", state); đường đi trả về chỉ gồm nhánh thành công
+def legacy_search(state, num_queens, path, steps):
+    if is_valid_state(state, num_queens):
+        steps.append(("solution", state.copy()))
+        return path + [("solution", state.copy())]
+    for candidate in get_candidates(state, num_queens):
+        steps.append(("trying", state.copy(), candidate))
+        new_path = path + [("trying", state.copy(), candidate)]
+        state.append(candidate)
+        result = legacy_search(state, num_queens, new_path, steps)
+        if result:
+            return result
+        state.pop()
+        if len(state) > 0:
+            steps.append(("backtrack", state.copy()))
+    return None
+
+@pytest.mark.parametrize("num_queens, initial", [(1, []), (3, []), (4, []), (6, []), (8, []), (8, [0, 4])])
+def test_steps_match_legacy_format(num_queens, initial):
+    steps = []
+    path = legacy_search(list(initial), num_queens, [], steps)
+    trace = record_search(num_queens, initial)
+    assert list(trace) == steps
+    assert len(trace) == len(steps)
+    assert trace.solution_path() == path
+    # Truy cập theo chỉ số và lát cắt cho cùng kết quả với danh sách
+    assert trace[5:17] == steps[5:17]
+    assert trace[1:20:3] == steps[1:20:3]
+    if steps:
+        assert trace[-1] == steps[-1] and trace[0] == steps[0]
+    with pytest.raises(IndexError):
+        trace[len(steps)]
@@ -0,0 +1,69 @@
+# Kiểm tra nhanh server.py trên localhost: khởi động, gọi các endpoint bằng
+# loadgen.HTTPClient rồi tắt.
+#
+# Cách chạy:  python -m pytest -q   (trong thư mục N_Queens)
+import asyncio
+import json
+from array import array
+
+from constrained import complete
+from engines import solve
+from loadgen import HTTPClient
+from server import SolverService, start_server
+from validation import is_valid_placement
+
+async def _smoke():
+    service = SolverService(workers=2)
+    server = await start_server(service, port=0)
+    port = server.sockets[0].getsockname()[1]
+    client = HTTPClient(port=port)
+    try:
+        status, _, body = await client.get("/health")
+        assert status == 200
+
+        status, _, body = await client.get("/count?n=8")
+        assert status == 200 and json.loads(body)["count"] == 92
+        status, _, body = await client.get("/count?n=8&fix=0,0&block=1,2")
+        assert json.loads(body)["count"] == len(list(complete(8, [(0, 0)], [(1, 2)])))
+        # N ngoài bảng đã biết cần long=1
+        status, _, body = await client.get("/count?n=40")
+        assert status == 400
+
+        status, _, body = await client.get("/solve?n=7")
+        assert status == 200
+        assert [json.loads(line) for line in body.splitlines()] == solve(7)
+        status, _, body = await client.get("/solve?n=8&fix=0,0&block=1,2")
+        assert [json.loads(line) for line in body.splitlines()] == list(complete(8, [(0, 0)], [(1, 2)]))
+        status, headers, body = await client.get("/solve?n=6&format=binary")
+        assert headers["x-queens-n"] == "6"
+        values = array("H", body).tolist()
+        assert [values[i:i + 6] for i in range(0, len(values), 6)] == solve(6)
+
+        status, _, body = await client.get("/first?n=200&seed=1")
+        assert status == 200 and is_valid_placement(json.loads(body)["solution"], 200)
+
+        # Các yêu cầu giống nhau chạy đồng thời: mọi client đều nhận đúng kết quả
+        clients = [HTTPClient(port=port) for _ in range(4)]
+        results = await asyncio.gather(*(other.get("/count?n=9&long=1&fix=0,1") for other in clients))
+        assert len({body for _, _, body in results}) == 1
+        for other in clients:
+            await other.close()
+
+        # Header hỏng: trả 400 thay vì làm hỏng kết nối
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"GET /health HTTP/1.1\r\nContent-Length: abc\r\n\r\n")
+        await writer.drain()
+        assert (await reader.readline()).split()[1] == b"400"
+        writer.close()
+        await writer.wait_closed()
+
+        status, _, body = await client.get("/stats")
+        assert json.loads(body)["requests"] >= 9
+    finally:
+        await client.close()
+        server.close()
+        await server.wait_closed()
+        service.close()
+
+def test_server_smoke():
+    asyncio.run(asyncio.wait_for(_smoke(), 60))
@@ -0,0 +1,45 @@
+# Kiểm tra store.py: ghi rồi đọc lại file lời giải phải khớp từng byte.
+#
+# Cách chạy:  python -m pytest -q   (trong thư mục N_Queens)
+import numpy as np
+import pytest
+
+from engines import solve
+from store import (FLAG_FUNDAMENTAL, HEADER, HEADER_SIZE, MAGIC, VERSION, load_solutions,
+                   save_solutions)
+from symmetry import fundamental_solutions
+
+@pytest.mark.parametrize("encoding", ["cols", "rank"])
+def test_store_round_trip_is_byte_exact(tmp_path, encoding):
+    solutions = solve(8)
+    path = tmp_path / "a.nqs"
+    assert save_solutions(str(path), 8, encoding=encoding) == len(solutions)
+    store = load_solutions(str(path))
+    assert store.encoding == encoding and len(store) == len(solutions)
+    assert store.tolist() == solutions
+    assert store[5].tolist() == solutions[5]
+
+    # Ghi lại từ chính dữ liệu vừa đọc phải ra đúng từng byte
+    copy_path = tmp_path / "b.nqs"
+    save_solutions(str(copy_path), 8, store.tolist(), encoding=encoding)
+    data = path.read_bytes()
+    assert copy_path.read_bytes() == data
+    assert data[:HEADER_SIZE] == HEADER.pack(MAGIC, VERSION, int(encoding == "rank"), 0, 8, 0,
+                                             len(solutions)).ljust(HEADER_SIZE, b"\0")
+    if encoding == "cols":
+        assert data[HEADER_SIZE:] == np.array(solutions, dtype=np.uint8).tobytes()
+
+@pytest.mark.parametrize("encoding", ["cols", "rank"])
+def test_store_fundamental_flag(tmp_path, encoding):
+    path = str(tmp_path / "f.nqs")
+    fundamentals = [solution for solution, _ in fundamental_solutions(8)]
+    save_solutions(path, 8, fundamentals, encoding=encoding, flags=FLAG_FUNDAMENTAL)
+    store = load_solutions(path)
+    assert store.flags == FLAG_FUNDAMENTAL
+    assert store.tolist() == fundamentals
+
+def test_empty_store(tmp_path):
+    path = str(tmp_path / "e.nqs")
+    assert save_solutions(path, 3) == 0
+    store = load_solutions(path)
+    assert len(store) == 0 and store.tolist() == []
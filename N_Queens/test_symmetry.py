@@ -0,0 +1,24 @@
+# Kiểm tra symmetry.py: lời giải cơ bản và kích thước quỹ đạo.
+#
+# Cách chạy:  python -m pytest -q   (trong thư mục N_Queens)
+import pytest
+
+from engines import count, solve
+from symmetry import canonical, fundamental_solutions, orbit, total_from_fundamental
+
+@pytest.mark.parametrize("num_queens", range(0, 11))
+def test_orbit_sizes_sum_to_count(num_queens):
+    fundamentals = fundamental_solutions(num_queens)
+    assert total_from_fundamental(fundamentals) == count(num_queens)
+    # Các quỹ đạo rời nhau và phủ hết mọi lời giải
+    images = set()
+    for solution, size in fundamentals:
+        assert len(orbit(solution)) == size
+        images |= orbit(solution)
+    assert images == {tuple(solution) for solution in solve(num_queens)}
+
+# Cắt tỉa trong lúc tìm kiếm cho đúng kết quả của việc lọc sau khi giải
+@pytest.mark.parametrize("num_queens", range(0, 10))
+def test_matches_post_filter(num_queens):
+    expected = [solution for solution in solve(num_queens) if canonical(solution) == solution]
+    assert [solution for solution, _ in fundamental_solutions(num_queens)] == expected
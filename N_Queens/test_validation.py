@@ -0,0 +1,48 @@
+# Kiểm tra validation.py: so với cách kiểm tra từng cặp quân hậu bằng Python.
+#
+# Cách chạy:  python -m pytest -q   (trong thư mục N_Queens)
+import numpy as np
+import pytest
+
+from engines import solve
+from rendering import _coordinate_table, format_solutions
+from validation import is_valid_placement, validate_batch
+
+def valid_pairwise(cols):
+    n = len(cols)
+    if any(not 0 <= c < n for c in cols):
+        return False
+    return all(cols[i] != cols[j] and abs(cols[i] - cols[j]) != j - i
+               for i in range(n) for j in range(i + 1, n))
+
+@pytest.mark.parametrize("num_queens", [1, 4, 6, 8])
+def test_against_pairwise_check(num_queens):
+    rng = np.random.default_rng(num_queens)
+    # Lời giải thật, hoán vị ngẫu nhiên và mảng có giá trị ngoài bàn cờ
+    batch = [solution for solution in solve(num_queens)]
+    batch += [rng.permutation(num_queens).tolist() for _ in range(50)]
+    batch += [rng.integers(-1, num_queens + 1, num_queens).tolist() for _ in range(50)]
+    expected = [valid_pairwise(cols) for cols in batch]
+    assert [is_valid_placement(cols) for cols in batch] == expected
+    assert validate_batch(batch).tolist() == expected
+
+def test_shape_checks():
+    assert is_valid_placement([])
+    assert not is_valid_placement([1, 3, 0, 2], num_queens=5)
+    assert validate_batch(np.zeros((3, 0), dtype=int)).tolist() == [True] * 3
+    with pytest.raises(ValueError):
+        validate_batch([1, 3, 0, 2])
+
+def test_format_solutions_reuses_coordinate_table():
+    solutions = solve(6)
+    expected = []
+    for index, cols in enumerate(solutions, start=3):
+        board = "".join(" ".join("Q" if c == col else "-" for c in range(6)) + "\n" for col in cols)
+        coords = ", ".join(f"({row}, {col})" for row, col in enumerate(cols))
+        expected.append(f"\n--- Loi giai {index}: {cols} ---\n{board}"
+                        f"Toa do cac quan hau (hàng, cột): {coords}\n")
+    assert format_solutions(solutions, start=3) == "".join(expected)
+    # Bảng tọa độ được dựng một lần cho mỗi N và không sửa được
+    assert _coordinate_table(6) is _coordinate_table(6)
+    with pytest.raises(ValueError):
+        _coordinate_table(6)[0, 0] = "x"
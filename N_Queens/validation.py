@@ -0,0 +1,58 @@
+# Kiểm tra tính hợp lệ của một cách đặt quân hậu bằng NumPy (không vòng lặp Python)
+import numpy as np
+
+# Các chỉ số trong `index` có đôi một khác nhau không: đánh dấu vào một mảng
+# bool rồi đếm (giống bincount nhưng chỉ tốn 1 byte cho mỗi ô)
+def _all_distinct(index, size):
+    seen = np.zeros(size, dtype=bool)
+    seen[index] = True
+    return np.count_nonzero(seen) == len(index)
+
+# Một cách đặt là mảng cols với cols[row] = cột của quân hậu ở hàng row.
+# Hợp lệ khi không có hai quân hậu nào chung cột, chung đường chéo
+# (row + col) hoặc chung đường chéo phụ (row - col).
+def is_valid_placement(cols, num_queens=None):
+    cols = np.asarray(cols)
+    n = len(cols) if num_queens is None else num_queens
+    if cols.ndim != 1 or len(cols) != n:
+        return False
+    if n == 0:
+        return True
+    if cols.min() < 0 or cols.max() >= n:
+        return False
+    # int32 đủ cho mọi chỉ số đường chéo khi 2N < 2^31, đỡ tốn bộ nhớ với N lớn
+    dtype = np.int32 if 2 * n < 2**31 else np.int64
+    cols = cols.astype(dtype, copy=False)
+    rows = np.arange(n, dtype=dtype)
+    # Mỗi cột, mỗi đường chéo chỉ được có tối đa một quân hậu
+    if not _all_distinct(cols, n):
+        return False
+    diagonal = rows + cols
+    if not _all_distinct(diagonal, 2 * n - 1):
+        return False
+    np.subtract(rows, cols, out=diagonal)
+    diagonal += n - 1
+    return _all_distinct(diagonal, 2 * n - 1)
+
+# Kiểm tra một lô lời giải cùng lúc. `solutions` có dạng (S, N); trả về mảng
+# bool (S,) cho biết từng lời giải có hợp lệ hay không.
+# Mỗi hàng của lô được dời sang một vùng chỉ số riêng (s * size) rồi đếm bằng
+# một lần bincount cho cả lô.
+def validate_batch(solutions):
+    solutions = np.asarray(solutions)
+    if solutions.ndim != 2:
+        raise ValueError("solutions phải là mảng 2 chiều (S, N)")
+    num_solutions, n = solutions.shape
+    if n == 0:
+        return np.ones(num_solutions, dtype=bool)
+    solutions = solutions.astype(np.int64, copy=False)
+    in_range = ((solutions >= 0) & (solutions < n)).all(axis=1)
+    # Thay các giá trị ngoài bàn cờ bằng 0 để chỉ số luôn hợp lệ (đã bị loại ở in_range)
+    cols = np.where(in_range[:, None], solutions, 0)
+    rows = np.arange(n, dtype=np.int64)
+    valid = in_range
+    for index, size in ((cols, n), (rows + cols, 2 * n - 1), (rows - cols + n - 1, 2 * n - 1)):
+        shifted = index + np.arange(num_solutions, dtype=np.int64)[:, None] * size
+        counts = np.bincount(shifted.ravel(), minlength=num_solutions * size)
+        valid &= counts.reshape(num_solutions, size).max(axis=1) <= 1
+    return valid